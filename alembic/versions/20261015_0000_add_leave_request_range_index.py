@@ -0,0 +1,29 @@
+"""Add composite date-range index to leave_requests
+
+Revision ID: add_leave_request_range_index
+Revises: add_joining_date_to_users
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_leave_request_range_index'
+down_revision = 'add_joining_date_to_users'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Composite index for leave/date-window overlap queries
+    op.create_index(
+        'ix_leave_requests_to_date_from_date',
+        'leave_requests',
+        ['to_date', 'from_date']
+    )
+
+
+def downgrade() -> None:
+    # Remove composite date-range index
+    op.drop_index('ix_leave_requests_to_date_from_date', table_name='leave_requests')
@@ -0,0 +1,29 @@
+"""Add composite (user_id, status, work_date) index to task_entries
+
+Revision ID: add_task_entry_user_status_date_index
+Revises: add_leave_request_range_index
+Create Date: 2026-10-15 01:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_entry_user_status_date_index'
+down_revision = 'add_leave_request_range_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Equality columns first so APPROVED entries for one user are a single range scan
+    op.create_index(
+        'ix_task_entries_user_status_work_date',
+        'task_entries',
+        ['user_id', 'status', 'work_date']
+    )
+
+
+def downgrade() -> None:
+    # Remove composite user/status/date index
+    op.drop_index('ix_task_entries_user_status_work_date', table_name='task_entries')
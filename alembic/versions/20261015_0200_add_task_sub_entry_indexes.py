@@ -0,0 +1,36 @@
+"""Add composite task_entry_id/client_id indexes to task_sub_entries
+
+Revision ID: add_task_sub_entry_indexes
+Revises: add_task_entry_user_status_date_index
+Create Date: 2026-10-15 02:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_sub_entry_indexes'
+down_revision = 'add_task_entry_user_status_date_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Parent lookups when loading, replacing or cascading sub-entries
+    op.create_index(
+        'ix_task_sub_entries_task_entry_client',
+        'task_sub_entries',
+        ['task_entry_id', 'client_id']
+    )
+    # Client filters resolve matching parent entries from the index alone
+    op.create_index(
+        'ix_task_sub_entries_client_task_entry',
+        'task_sub_entries',
+        ['client_id', 'task_entry_id']
+    )
+
+
+def downgrade() -> None:
+    # Remove composite sub-entry indexes
+    op.drop_index('ix_task_sub_entries_client_task_entry', table_name='task_sub_entries')
+    op.drop_index('ix_task_sub_entries_task_entry_client', table_name='task_sub_entries')
@@ -0,0 +1,30 @@
+"""Add (work_date, created_at, id) index to task_entries for admin list paging
+
+Revision ID: add_task_entry_list_index
+Revises: add_task_sub_entry_indexes
+Create Date: 2026-10-15 03:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_entry_list_index'
+down_revision = 'add_task_sub_entry_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Admin list pages seek on this order; the per-user list already uses
+    # uq_user_work_date, which InnoDB suffixes with the id primary key
+    op.create_index(
+        'ix_task_entries_work_date_created_at_id',
+        'task_entries',
+        ['work_date', 'created_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    # Remove admin list index
+    op.drop_index('ix_task_entries_work_date_created_at_id', table_name='task_entries')
@@ -0,0 +1,30 @@
+"""Add composite (user_id, status, from_date, to_date) index to leave_requests
+
+Revision ID: add_leave_request_user_status_index
+Revises: add_task_entry_list_index
+Create Date: 2026-10-15 04:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_leave_request_user_status_index'
+down_revision = 'add_task_entry_list_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Approved-leave checks on task entry and leave creation filter one user
+    # and status, then compare both dates; the index covers the whole EXISTS
+    op.create_index(
+        'ix_leave_requests_user_status_dates',
+        'leave_requests',
+        ['user_id', 'status', 'from_date', 'to_date']
+    )
+
+
+def downgrade() -> None:
+    # Remove composite user/status/date index
+    op.drop_index('ix_leave_requests_user_status_dates', table_name='leave_requests')
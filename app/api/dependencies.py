@@ -1,7 +1,9 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from app.db.session import get_db
+from app.core.query_filters import parse_csv_ids
 from app.core.security import decode_access_token
 from app.models.user import User, UserRole
 from app.schemas import TokenData
@@ -68,3 +70,30 @@ def require_admin(
             detail="Not enough permissions"
         )
     return current_user
+
+
+def id_list_filter(name: str):
+    """Build a dependency that parses and validates an id list query param.
+
+    The param may be repeated and/or comma-separated; malformed ids are
+    rejected with 422 before any query runs.
+    """
+    def dependency(
+        values: Optional[List[str]] = Query(None, alias=name, description="Repeated and/or comma-separated UUIDs")
+    ) -> Optional[List[str]]:
+        ids = parse_csv_ids(values)
+        if not ids:
+            return None
+        try:
+            return [str(UUID(value)) for value in ids]
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{name} must contain valid UUIDs"
+            )
+    return dependency
+
+
+user_ids_filter = id_list_filter("user_ids")
+client_ids_filter = id_list_filter("client_ids")
+task_master_ids_filter = id_list_filter("task_master_ids")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -26,8 +26,10 @@ def list_pending_task_entries(
     query = db.query(TaskEntry).options(
         joinedload(TaskEntry.user),
         joinedload(TaskEntry.client),
-        joinedload(TaskEntry.sub_entries).joinedload(TaskSubEntry.client),
-        joinedload(TaskEntry.sub_entries).joinedload(TaskSubEntry.task_master)
+        selectinload(TaskEntry.sub_entries).options(
+            joinedload(TaskSubEntry.client),
+            joinedload(TaskSubEntry.task_master),
+        )
     )
     
     if status_filter:
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
-from typing import List, Optional, Tuple
-from datetime import date
+from typing import List, Optional
 from decimal import Decimal
 import io
 from openpyxl import load_workbook
@@ -11,48 +10,22 @@ from app.models.user import User
 from app.models.task_entry import TaskEntry, TaskSubEntry, TaskEntryStatus
 from app.models.client import Client
 from app.models.task_master import TaskMaster
-from app.models.working_saturday import WorkingSaturday
-from app.models.holiday import Holiday
 from app.api.dependencies import get_current_user, require_admin
+from app.api.endpoints.task_entries import ZERO, calculate_task_status
 
 router = APIRouter(prefix="/bulk", tags=["Bulk Upload"])
 
 
-def is_holiday(work_date: date, db: Session) -> bool:
-    holiday = db.query(Holiday).filter(Holiday.holiday_date == work_date).first()
-    return holiday is not None
+def load_by_name(db: Session, model, names) -> dict:
+    """Fetch the rows of `model` named in `names` with one query, keyed by case-folded name.
 
-
-def is_working_saturday(work_date: date, db: Session) -> bool:
-    ws = db.query(WorkingSaturday).filter(WorkingSaturday.work_date == work_date).first()
-    return ws is not None
-
-
-def is_weekend(work_date: date) -> bool:
-    return work_date.weekday() in [5, 6]
-
-
-def calculate_task_status(work_date: date, total_hours: Decimal, db: Session) -> Tuple[TaskEntryStatus, bool, Decimal]:
-
-    is_hol = is_holiday(work_date, db)
-    is_weekend_day = is_weekend(work_date)
-    is_work_sat = work_date.weekday() == 5 and is_working_saturday(work_date, db)
-
-    is_non_working_day = (
-        is_hol
-        or (is_weekend_day and not is_work_sat)
-    )
-
-    if is_non_working_day:
-        return TaskEntryStatus.PENDING, True, total_hours
-
-    if total_hours == Decimal(8):
-        return TaskEntryStatus.APPROVED, False, Decimal(0)
-
-    if total_hours > Decimal(8):
-        return TaskEntryStatus.PENDING, True, total_hours - Decimal(8)
-
-    return TaskEntryStatus.PENDING, False, Decimal(0)
+    Keys are case-folded so lookups match the way the old per-row name filter
+    did on MySQL's case-insensitive collation.
+    """
+    rows = {}
+    for row in db.query(model).filter(model.name.in_(names)):
+        rows.setdefault(row.name.casefold(), row)
+    return rows
 
 
 @router.post("/upload-task-entries")
@@ -93,6 +66,11 @@ async def upload_task_entries(
         def requires_production_only(task_name: str) -> bool:
             return "gp task" in task_name.lower()
 
+        # Resolve every referenced user, client and task once instead of per row
+        users_by_name = load_by_name(db, User, {str(v).strip() for v in df["Coder Name"]})
+        clients_by_name = load_by_name(db, Client, {str(v).strip() for v in df["Client"]})
+        task_masters_by_name = load_by_name(db, TaskMaster, {str(v).strip() for v in df["Task"]})
+
         # ---------------- VALIDATION ---------------- #
 
         for index, row in df.iterrows():
@@ -104,21 +82,21 @@ async def upload_task_entries(
                 client_name = str(row["Client"]).strip()
                 task_name = str(row["Task"]).strip()
 
-                production = Decimal(str(row["Count"])) if not pd.isna(row["Count"]) else Decimal("0")
-                hours = Decimal(str(row["Time"])) if not pd.isna(row["Time"]) else Decimal("0")
+                production = Decimal(str(row["Count"])) if not pd.isna(row["Count"]) else ZERO
+                hours = Decimal(str(row["Time"])) if not pd.isna(row["Time"]) else ZERO
 
                 if not coder_name or not client_name or not task_name:
                     raise ValueError("Required fields missing")
 
-                user = db.query(User).filter(User.name == coder_name).first()
+                user = users_by_name.get(coder_name.casefold())
                 if not user:
                     raise ValueError(f"User not found: {coder_name}")
 
-                client = db.query(Client).filter(Client.name == client_name).first()
+                client = clients_by_name.get(client_name.casefold())
                 if not client:
                     raise ValueError(f"Client not found: {client_name}")
 
-                task_master = db.query(TaskMaster).filter(TaskMaster.name == task_name).first()
+                task_master = task_masters_by_name.get(task_name.casefold())
                 if not task_master:
                     raise ValueError(f"Task not found: {task_name}")
 
@@ -206,7 +184,7 @@ async def upload_task_entries(
                     user_id=row["user"].id,
                     client_id=row["client"].id,
                     work_date=row["work_date"],
-                    total_hours=Decimal("0"),
+                    total_hours=ZERO,
                     status=TaskEntryStatus.PENDING,  # FIXED: use Enum
                     created_by=current_user.id,
                     updated_by=current_user.id
@@ -246,21 +224,10 @@ async def upload_task_entries(
 
             print(f"Parent Entry for {parent.work_date} - Total Hours: {parent.total_hours}, Clients: {client_list}")
 
-            # ✅ APPROVAL BASED ON TOTAL HOURS (NOT SUBTASK COUNT)
-            if parent.total_hours == Decimal("8"):
-                parent.status = TaskEntryStatus.APPROVED
-                parent.is_overtime = False
-                parent.overtime_hours = Decimal("0")
-
-            elif parent.total_hours > Decimal("8"):
-                parent.status = TaskEntryStatus.PENDING
-                parent.is_overtime = True
-                parent.overtime_hours = parent.total_hours - Decimal("8")
-
-            else:
-                parent.status = TaskEntryStatus.PENDING
-                parent.is_overtime = False
-                parent.overtime_hours = Decimal("0")
+            # ✅ APPROVAL BASED ON TOTAL HOURS (NOT SUBTASK COUNT), same rules as manual entries
+            parent.status, parent.is_overtime, parent.overtime_hours = calculate_task_status(
+                parent.work_date, parent.total_hours, db
+            )
 
             del parent._clients
             del parent._subtask_count
@@ -17,6 +17,7 @@ from app.models.holiday import Holiday
 from app.models.user import User, UserRole
 from app.schemas import HolidayCreate, HolidayUpdate, HolidayResponse, HolidayBulkCreate
 from app.api.dependencies import get_current_user
+from app.services.calendar_cache import invalidate_calendar, is_holiday
 
 router = APIRouter(prefix="/admin/holidays", tags=["admin", "holidays"])
 
@@ -109,6 +110,7 @@ def create_holiday(
     
     db.add(holiday)
     db.commit()
+    invalidate_calendar()
     db.refresh(holiday)
     
     return holiday
@@ -163,6 +165,7 @@ def create_holidays_bulk(
     
     if created_holidays:
         db.commit()
+        invalidate_calendar()
         for holiday in created_holidays:
             db.refresh(holiday)
     
@@ -218,6 +221,7 @@ def update_holiday(
         holiday.is_mandatory = holiday_data.is_mandatory
     
     db.commit()
+    invalidate_calendar()
     db.refresh(holiday)
     
     return holiday
@@ -241,6 +245,7 @@ def delete_holiday(
     
     db.delete(holiday)
     db.commit()
+    invalidate_calendar()
     
     return None
 
@@ -256,7 +261,10 @@ def check_holiday(
     
     Returns holiday information if found, or indicates it's not a holiday.
     """
-    holiday = db.query(Holiday).filter(Holiday.holiday_date == check_date).first()
+    # Most dates are not holidays; only fetch the row when the cached calendar has it
+    holiday = None
+    if is_holiday(check_date, db):
+        holiday = db.query(Holiday).filter(Holiday.holiday_date == check_date).first()
     
     if holiday:
         return {
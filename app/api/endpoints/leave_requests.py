@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import exists
 from typing import List, Optional
 from uuid import UUID
 from datetime import date
@@ -63,42 +63,32 @@ def create_leave_request(
 ):
     """Create a new leave request."""
     # Check for overlapping approved leaves
-    overlapping_leave = db.query(LeaveRequest).filter(
-        LeaveRequest.user_id == current_user.id,
-        LeaveRequest.status == LeaveStatus.APPROVED,
-        or_(
-            and_(
-                LeaveRequest.from_date <= leave_create.from_date,
-                LeaveRequest.to_date >= leave_create.from_date
-            ),
-            and_(
-                LeaveRequest.from_date <= leave_create.to_date,
-                LeaveRequest.to_date >= leave_create.to_date
-            ),
-            and_(
-                LeaveRequest.from_date >= leave_create.from_date,
-                LeaveRequest.to_date <= leave_create.to_date
-            )
+    has_overlapping_leave = db.query(
+        exists().where(
+            LeaveRequest.user_id == current_user.id,
+            LeaveRequest.status == LeaveStatus.APPROVED,
+            LeaveRequest.from_date <= leave_create.to_date,
+            LeaveRequest.to_date >= leave_create.from_date
         )
-    ).first()
+    ).scalar()
     
-    if overlapping_leave:
+    if has_overlapping_leave:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Leave request overlaps with existing approved leave"
         )
     
     # Check for task entries in the date range
-    task_entry = db.query(TaskEntry).filter(
+    task_entry_date = db.query(TaskEntry.work_date).filter(
         TaskEntry.user_id == current_user.id,
         TaskEntry.work_date >= leave_create.from_date,
         TaskEntry.work_date <= leave_create.to_date
-    ).first()
+    ).order_by(TaskEntry.work_date).limit(1).scalar()
     
-    if task_entry:
+    if task_entry_date:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Task entry exists for date {task_entry.work_date}. Cannot apply leave for this period."
+            detail=f"Task entry exists for date {task_entry_date}. Cannot apply leave for this period."
         )
     
     # Create leave request
@@ -1,11 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse, ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, or_
+from sqlalchemy import select, func, case, or_, Float
+import csv
+import os
+import time
 from typing import List, Optional
 from uuid import UUID
-from datetime import date, timedelta
-from io import BytesIO
+from datetime import date
+from io import TextIOWrapper
+from itertools import chain, groupby
+from math import fsum
+from operator import attrgetter
+from tempfile import NamedTemporaryFile, SpooledTemporaryFile
 from decimal import Decimal
 from app.db.session import get_db
 from app.models.user import User
@@ -13,23 +21,170 @@ from app.models.task_entry import TaskEntry, TaskEntryStatus, TaskSubEntry
 from app.models.leave_request import LeaveRequest, LeaveStatus
 from app.models.client import Client
 from app.models.task_master import TaskMaster
-from app.models.holiday import Holiday
-from app.models.working_saturday import WorkingSaturday
-from app.schemas import TimesheetReportItem, AttendanceReportItem, LeaveReportItem, ProductionReportItem
-from app.api.dependencies import require_admin, get_current_user
+from app.schemas import (
+    TimesheetReportItem, AttendanceReportItem, LeaveReportItem, LeaveSummaryItem, ProductionReportItem
+)
+from app.api.dependencies import (
+    require_admin, get_current_user, user_ids_filter, client_ids_filter, task_master_ids_filter
+)
 from app.core.date_filters import get_date_range
+from app.core.query_filters import filter_ids
+from app.core.config import settings
+from app.services.attendance_report import build_attendance_rows
 
+# Report queries select columns only and never load ORM entities, so there are
+# no relationships to lazy-load and rows can stream; keep new queries that way.
 router = APIRouter(prefix="/admin/reports", tags=["Admin - Reports"])
 
+# ── Excel formats ────────────────────────────────────────────────────────
+# xlsxwriter formats belong to a workbook, so only their properties are
+# shared; each export registers them once with wb.add_format().
+TITLE_FORMAT = {
+    'bold': True, 'font_size': 14, 'font_color': '#FFFFFF', 'bg_color': '#1F4E78',
+    'align': 'center', 'valign': 'vcenter',
+}
+CLIENT_HEADER_FORMAT = {
+    'bold': True, 'font_size': 12, 'font_color': '#FFFFFF', 'bg_color': '#366092',
+    'align': 'center', 'valign': 'vcenter',
+}
+HEADER_FORMAT = {
+    'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#4472C4',
+    'align': 'center', 'valign': 'vcenter', 'border': 1,
+}
+NO_DATA_FORMAT = {'italic': True, 'font_size': 12, 'align': 'center', 'valign': 'vcenter'}
+CELL_FORMAT = {'border': 1}
+SUBTOTAL_FORMAT = {'bold': True, 'font_size': 11, 'bg_color': '#D9E1F2', 'border': 1}
+GRAND_TOTAL_FORMAT = {
+    'bold': True, 'font_size': 12, 'bg_color': '#FFC000',
+    'align': 'center', 'valign': 'vcenter', 'border': 1,
+}
+# Leave rows carry real dates; the number format leaves the text cells as-is
+APPROVED_FORMAT = {'bg_color': '#C6EFCE', 'border': 1, 'num_format': 'yyyy-mm-dd'}
+REJECTED_FORMAT = {'bg_color': '#FFC7CE', 'border': 1, 'num_format': 'yyyy-mm-dd'}
+PENDING_FORMAT = {'bg_color': '#FFEB9C', 'border': 1, 'num_format': 'yyyy-mm-dd'}
+EXPORT_FORMATS = {
+    'title': TITLE_FORMAT,
+    'client_header': CLIENT_HEADER_FORMAT,
+    'header': HEADER_FORMAT,
+    'no_data': NO_DATA_FORMAT,
+    'cell': CELL_FORMAT,
+    'subtotal': SUBTOTAL_FORMAT,
+    'grand_total': GRAND_TOTAL_FORMAT,
+    'approved': APPROVED_FORMAT,
+    'rejected': REJECTED_FORMAT,
+    'pending': PENDING_FORMAT,
+}
+
+MY_REPORT_HEADERS = ("Task Name", "Production", "Hours", "Efficiency")
+# (first column, last column, width) spans, set before any row is written
+MY_REPORT_COLUMN_WIDTHS = ((0, 0, 30), (1, 3, 15))
+MY_REPORT_DISPOSITION = "attachment; filename=my_productivity_report_%s_%s.xlsx"
+
+TIMESHEET_HEADERS = ("Client", "Employee", "Task Name", "Production", "Hours", "Efficiency")
+TIMESHEET_COLUMN_WIDTHS = ((0, 0, 25), (1, 1, 20), (2, 2, 25), (3, 3, 14), (4, 4, 12), (5, 5, 14))
+
+ATTENDANCE_HEADERS = ("Date", "Employee", "Status", "Production", "Client(s)")
+ATTENDANCE_COLUMN_WIDTHS = ((0, 0, 14), (1, 1, 22), (2, 2, 28), (3, 3, 14), (4, 4, 28))
+
+LEAVE_HEADERS = ("Employee", "From", "To", "Reason", "Status", "Admin Comment")
+LEAVE_COLUMN_WIDTHS = ((0, 0, 22), (1, 2, 14), (3, 3, 35), (4, 4, 14), (5, 5, 30))
+
+
+def add_export_formats(wb) -> dict:
+    """Register the shared export formats on an xlsxwriter workbook."""
+    return {name: wb.add_format(props) for name, props in EXPORT_FORMATS.items()}
+
+
+EXPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+EXPORT_CHUNK_SIZE = 64 * 1024
+EXPORT_YIELD_PER = 1000
+
+
+EXPORT_ACCEL_MAX_AGE = 60 * 60
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MEDIA_TYPE = "text/csv"
+
+
+def iter_file_chunks(file, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Yield a finished export file in chunks, closing it once drained."""
+    with file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def purge_stale_exports(directory: str):
+    """Remove handed-off export files nginx has had ample time to serve."""
+    cutoff = time.time() - EXPORT_ACCEL_MAX_AGE
+    for entry in os.scandir(directory):
+        if entry.name.endswith((".xlsx", ".csv")) and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def open_export_file(suffix: str = ".xlsx"):
+    """Open the file an export is written to.
+
+    With EXPORT_ACCEL_DIR configured the file is kept on disk for nginx to
+    serve; otherwise it is an anonymous spooled file streamed by the app.
+    """
+    if not settings.EXPORT_ACCEL_DIR:
+        return SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+    purge_stale_exports(settings.EXPORT_ACCEL_DIR)
+    excel_file = NamedTemporaryFile(dir=settings.EXPORT_ACCEL_DIR, suffix=suffix, delete=False)
+    os.chmod(excel_file.name, 0o644)  # nginx workers run as a different user
+    return excel_file
+
+
+def export_file_response(excel_file, disposition: str, media_type: str = XLSX_MEDIA_TYPE):
+    """Return a finished export, via X-Accel-Redirect when nginx offload is on."""
+    if settings.EXPORT_ACCEL_DIR:
+        excel_file.close()
+        return Response(
+            media_type=media_type,
+            headers={
+                "X-Accel-Redirect": settings.EXPORT_ACCEL_LOCATION + os.path.basename(excel_file.name),
+                "Content-Disposition": disposition,
+            }
+        )
+    return StreamingResponse(
+        iter_file_chunks(excel_file),
+        media_type=media_type,
+        headers={"Content-Disposition": disposition}
+    )
+
+
+def write_csv_export(headers, rows):
+    """Write plain rows to an export file as CSV and rewind it.
+
+    The UTF-8 BOM lets Excel pick the right encoding for non-ASCII names.
+    """
+    export_file = open_export_file(".csv")
+    text = TextIOWrapper(export_file, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text)
+    writer.writerow(headers)
+    writer.writerows(rows)
+    text.flush()
+    text.detach()  # leave the underlying file open for the response
+    export_file.seek(0)
+    return export_file
 
-@router.get("/timesheet", response_model=List[ProductionReportItem])
+
+def aggregate_productivity(prods: List[float], hours: List[float]):
+    """Return rounded per-row efficiencies plus the production and hours totals."""
+    effs = [round(prod / hrs, 2) if hrs > 0 else 0 for prod, hrs in zip(prods, hours)]
+    return effs, fsum(prods), fsum(hours)
+
+
+@router.get("/timesheet", response_model=List[ProductionReportItem], response_class=ORJSONResponse)
 def get_timesheet_report(
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     date_range: Optional[str] = Query(None),
-    user_ids: Optional[str] = Query(None),  # Comma-separated UUIDs
-    client_ids: Optional[str] = Query(None),  # Comma-separated UUIDs
-    task_master_ids: Optional[str] = Query(None),  # Comma-separated UUIDs
+    user_ids: Optional[List[str]] = Depends(user_ids_filter),
+    client_ids: Optional[List[str]] = Depends(client_ids_filter),
+    task_master_ids: Optional[List[str]] = Depends(task_master_ids_filter),
     is_profitable: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
     _: User = Depends(require_admin)
@@ -42,12 +197,12 @@ def get_timesheet_report(
         else:
             from_date, to_date = get_date_range("this_month")
 
-    query = db.query(
+    stmt = select(
         func.coalesce(Client.name, 'No Client').label('client_name'),
         User.name.label('employee_name'),
         TaskMaster.name.label('task_name'),
-        func.sum(TaskSubEntry.production).label('total_production'),
-        func.sum(TaskSubEntry.hours).label('total_hours'),
+        func.coalesce(func.sum(TaskSubEntry.production), 0).cast(Float).label('total_production'),
+        func.coalesce(func.sum(TaskSubEntry.hours), 0).cast(Float).label('total_hours'),
     ).join(
         TaskEntry, TaskSubEntry.task_entry_id == TaskEntry.id
     ).outerjoin(
@@ -56,7 +211,7 @@ def get_timesheet_report(
         TaskMaster, TaskSubEntry.task_master_id == TaskMaster.id
     ).join(
         User, TaskEntry.user_id == User.id
-    ).filter(
+    ).where(
         TaskEntry.work_date >= from_date,
         TaskEntry.work_date <= to_date,
         TaskEntry.status == TaskEntryStatus.APPROVED,
@@ -65,48 +220,44 @@ def get_timesheet_report(
 
     # Multi-select filters
     if user_ids:
-        user_id_list = [uid.strip() for uid in user_ids.split(',') if uid.strip()]
-        if user_id_list:
-            query = query.filter(TaskEntry.user_id.in_(user_id_list))
+        stmt = stmt.where(filter_ids(TaskEntry.user_id, user_ids))
 
     if client_ids:
-        client_id_list = [cid.strip() for cid in client_ids.split(',') if cid.strip()]
-        if client_id_list:
-            query = query.filter(TaskSubEntry.client_id.in_(client_id_list))
+        stmt = stmt.where(filter_ids(TaskSubEntry.client_id, client_ids))
 
     if task_master_ids:
-        task_master_id_list = [tmid.strip() for tmid in task_master_ids.split(',') if tmid.strip()]
-        if task_master_id_list:
-            query = query.filter(TaskSubEntry.task_master_id.in_(task_master_id_list))
+        stmt = stmt.where(filter_ids(TaskSubEntry.task_master_id, task_master_ids))
 
     if is_profitable is not None:
-        query = query.filter(TaskMaster.is_profitable == is_profitable)
+        stmt = stmt.where(TaskMaster.is_profitable == is_profitable)
 
-    query = query.group_by(
+    stmt = stmt.group_by(
         Client.name, User.name, TaskMaster.name
     ).order_by(Client.name, User.name, TaskMaster.name)
 
-    results = query.all()
-
-    return [
-        ProductionReportItem(
-            client_name=row.client_name,
-            employee_name=row.employee_name,
-            task_name=row.task_name,
-            production=float(row.total_production or 0),
-            hours=float(row.total_hours or 0),
-            efficiency=round(float(row.total_production or 0) / float(row.total_hours) if row.total_hours else 0, 2),
-        )
+    results = db.execute(stmt).all()
+
+    # Rows already have the ProductionReportItem shape; returning the response
+    # directly skips per-row model validation (response_model stays for docs)
+    return ORJSONResponse([
+        {
+            "client_name": row.client_name,
+            "employee_name": row.employee_name,
+            "task_name": row.task_name,
+            "production": row.total_production,
+            "hours": row.total_hours,
+            "efficiency": round(row.total_production / row.total_hours if row.total_hours else 0, 2),
+        }
         for row in results
-    ]
+    ])
 
 
-@router.get("/attendance", response_model=List[AttendanceReportItem])
+@router.get("/attendance", response_model=List[AttendanceReportItem], response_class=ORJSONResponse)
 def get_attendance_report(
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     date_range: Optional[str] = Query(None),
-    user_ids: Optional[str] = Query(None),
+    user_ids: Optional[List[str]] = Depends(user_ids_filter),
     is_profitable: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
     _: User = Depends(require_admin)
@@ -120,219 +271,26 @@ def get_attendance_report(
             detail="Either provide from_date and to_date, or date_range"
         )
 
-    # ── Load Users ────────────────────────────────────────────────
-    user_query = db.query(User).filter(
-        User.is_active == True,
-        User.role.in_(["EMPLOYEE", "SUPERVISOR"])
-    )
-
-    if user_ids:
-        uid_list = [u.strip() for u in user_ids.split(",") if u.strip()]
-        if uid_list:
-            user_query = user_query.filter(User.id.in_(uid_list))
-
-    users = user_query.order_by(User.name).all()
-    user_id_strs = [str(u.id) for u in users]
-
-    # ── Holidays ─────────────────────────────────────────────────
-    holiday_map = {
-        row.holiday_date: row.name
-        for row in db.query(Holiday.holiday_date, Holiday.name).filter(
-            Holiday.holiday_date >= from_date,
-            Holiday.holiday_date <= to_date
-        ).all()
-    }
-
-    # ── Working Saturdays ───────────────────────────────────────
-    working_saturday_set = {
-        row.work_date
-        for row in db.query(WorkingSaturday.work_date).filter(
-            WorkingSaturday.work_date >= from_date,
-            WorkingSaturday.work_date <= to_date
-        ).all()
-    }
-
-    # ── Leave Task Master (Exact Match) ─────────────────────────
-    leave_tm_ids = {
-        row.id for row in db.query(TaskMaster.id).filter(
-            func.lower(TaskMaster.name) == "leave"
-        ).all()
-    }
-
-    # ── Leave Hours Aggregation ─────────────────────────────────
-    from collections import defaultdict
-    leave_hours_map = defaultdict(float)
-
-    leave_q = db.query(
-        TaskEntry.user_id,
-        TaskEntry.work_date,
-        func.sum(TaskSubEntry.hours).label("total_leave_hours")
-    ).join(
-        TaskSubEntry, TaskEntry.id == TaskSubEntry.task_entry_id
-    ).filter(
-        TaskEntry.work_date >= from_date,
-        TaskEntry.work_date <= to_date,
-        TaskEntry.status == TaskEntryStatus.APPROVED,
-        TaskEntry.user_id.in_(user_id_strs),
-        TaskSubEntry.task_master_id.in_(leave_tm_ids),
-    ).group_by(
-        TaskEntry.user_id,
-        TaskEntry.work_date
-    )
-
-    for row in leave_q.all():
-        leave_hours_map[(str(row.user_id), row.work_date)] = float(row.total_leave_hours or 0)
-
-    # ── Entry Status Map ────────────────────────────────────────
-    STATUS_PRIORITY = {
-        TaskEntryStatus.APPROVED: 4,
-        TaskEntryStatus.PENDING: 3,
-        TaskEntryStatus.DRAFT: 2,
-        TaskEntryStatus.REJECTED: 1,
-    }
-
-    entry_map = {}
-
-    for er in db.query(TaskEntry.user_id, TaskEntry.work_date, TaskEntry.status).filter(
-        TaskEntry.work_date >= from_date,
-        TaskEntry.work_date <= to_date,
-        TaskEntry.user_id.in_(user_id_strs)
-    ).all():
-
-        key = (str(er.user_id), er.work_date)
-        if key not in entry_map or STATUS_PRIORITY.get(er.status, 0) > STATUS_PRIORITY.get(entry_map[key], 0):
-            entry_map[key] = er.status
-
-    # ── Production Map ──────────────────────────────────────────
-    prod_map = defaultdict(lambda: {"production": 0.0, "clients": []})
-
-    prod_q = db.query(
-        TaskEntry.user_id,
-        TaskEntry.work_date,
-        func.coalesce(Client.name, "No Client").label("client_name"),
-        func.sum(TaskSubEntry.production).label("total_production"),
-    ).join(
-        TaskSubEntry, TaskEntry.id == TaskSubEntry.task_entry_id
-    ).outerjoin(
-        Client, TaskSubEntry.client_id == Client.id
-    ).filter(
-        TaskEntry.work_date >= from_date,
-        TaskEntry.work_date <= to_date,
-        TaskEntry.status == TaskEntryStatus.APPROVED,
-        TaskEntry.user_id.in_(user_id_strs),
-    )
-
-    if is_profitable is not None:
-        prod_q = prod_q.join(
-            TaskMaster, TaskSubEntry.task_master_id == TaskMaster.id
-        ).filter(TaskMaster.is_profitable == is_profitable)
-
-    prod_q = prod_q.group_by(TaskEntry.user_id, TaskEntry.work_date, Client.name)
-
-    for pr in prod_q.all():
-        key = (str(pr.user_id), pr.work_date)
-        prod_map[key]["production"] += float(pr.total_production or 0)
-        if pr.client_name and pr.client_name not in prod_map[key]["clients"]:
-            prod_map[key]["clients"].append(pr.client_name)
-
-    # ── Build Report ─────────────────────────────────────────────
-    report_items = []
-    current_date = from_date
-    while current_date <= to_date:
-
-        weekday = current_date.weekday()
-        is_sunday = weekday == 6
-        is_saturday = weekday == 5
-        is_working_saturday = current_date in working_saturday_set
-        in_holiday_map = current_date in holiday_map
-
-        # Check if current date is a non-working day (weekend/holiday)
-        is_non_working_day = is_sunday or in_holiday_map or (is_saturday and not is_working_saturday)
-
-        for user in users:
-
-            uid = str(user.id)
-            entry_key = (uid, current_date)
-
-            # Skip records before user's joining date
-            if user.joining_date and current_date < user.joining_date.date():
-                continue
-
-            pd = prod_map.get(entry_key)
-            leave_hours = leave_hours_map.get(entry_key, 0)
-
-            is_full_day_leave = False
-            is_half_day_leave = False
-            is_short_leave = False
-            has_production = pd and pd["production"] > 0
-
-            if user.role == "SUPERVISOR":
-                has_production = pd and pd["production"] > 0
-                attendance_status = "PRESENT"
-                production = round(pd["production"], 2) if pd else 0.0
-                client_names_str = ", ".join(pd["clients"]) if pd and pd["clients"] else None
-
-                # Mark as OVERTIME if working on non-working day (weekend/holiday)
-                if is_non_working_day and has_production:
-                    attendance_status = "OVERTIME"
-                elif is_non_working_day and not has_production:
-                    continue  # Skip non-working day records with no production for supervisors
-
-            elif entry_key in entry_map and entry_map[entry_key] == TaskEntryStatus.APPROVED:
-
-                # Categorize Leave
-                if leave_hours >= 8 or leave_hours > 4:
-                    is_full_day_leave = True
-                elif leave_hours > 2:
-                    is_half_day_leave = True
-                elif leave_hours > 0:
-                    is_short_leave = True
-
-                if has_production:
-                    attendance_status = "PRESENT"
-                    production = round(pd["production"], 2)
-                    client_names_str = ", ".join(pd["clients"]) if pd["clients"] else None
-                elif leave_hours > 0:
-                    attendance_status = "LEAVE"
-                    production = None
-                    client_names_str = None
-                else:
-                    attendance_status = "ABSENT"
-                    production = None
-                    client_names_str = None
-
-                # Mark as OVERTIME if working on non-working day (weekend/holiday)
-                if is_non_working_day and has_production:
-                    attendance_status = "OVERTIME"
-
-            else:
-                attendance_status = "ABSENT"
-                production = None
-                client_names_str = None
-
-            # Skip ABSENT records on non-working days (treat as holidays)
-            if is_non_working_day and attendance_status == "ABSENT":
-                continue
-
-            report_items.append(AttendanceReportItem(
-                date=current_date,
-                employee_name=user.name,
-                employee_email=user.email,
-                attendance_status=attendance_status,
-                is_holiday=False,
-                production=production,
-                client_names=client_names_str,
-                is_full_day_leave=is_full_day_leave,
-                is_half_day_leave=is_half_day_leave,
-                is_short_leave=is_short_leave,
-                leave_hours=leave_hours if leave_hours > 0 else None
-            ))
-
-        current_date += timedelta(days=1)
-
-    return report_items
-
-@router.get("/leave", response_model=List[LeaveReportItem])
+    rows = build_attendance_rows(db, from_date, to_date, user_ids, is_profitable)
+
+    # Serialized straight to AttendanceReportItem-shaped dicts, skipping
+    # per-row model validation (response_model stays for docs)
+    return ORJSONResponse([
+        {
+            "date": row.date,
+            "employee_name": row.employee_name,
+            "employee_email": row.employee_email,
+            "attendance_status": row.attendance_status,
+            "is_holiday": False,
+            "production": row.production,
+            "client_names": row.client_names,
+            "is_short_leave": row.is_short_leave,
+            "is_half_day_leave": row.is_half_day_leave,
+        }
+        for row in rows
+    ])
+
+@router.get("/leave", response_model=List[LeaveReportItem], response_class=ORJSONResponse)
 def get_leave_report(
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
@@ -351,7 +309,7 @@ def get_leave_report(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Either provide from_date and to_date, or date_range"
         )
-    query = db.query(
+    stmt = select(
         LeaveRequest.from_date,
         LeaveRequest.to_date,
         User.name,
@@ -362,19 +320,19 @@ def get_leave_report(
     ).join(User, LeaveRequest.user_id == User.id)
     
     # Apply filters - get leaves that overlap with the date range
-    query = query.filter(
+    stmt = stmt.where(
         LeaveRequest.from_date <= to_date,
         LeaveRequest.to_date >= from_date
     )
     
     # Filter out admin users - only show employee records
-    query = query.filter(User.role == 'EMPLOYEE')
+    stmt = stmt.where(User.role == 'EMPLOYEE')
     
     if user_id:
-        query = query.filter(LeaveRequest.user_id == user_id)
+        stmt = stmt.where(LeaveRequest.user_id == user_id)
     # Note: is_profitable filter doesn't apply to leave requests
     
-    results = query.order_by(LeaveRequest.from_date.desc()).all()
+    results = db.execute(stmt.order_by(LeaveRequest.from_date.desc())).all()
     
     return [
         LeaveReportItem(
@@ -390,23 +348,63 @@ def get_leave_report(
     ]
 
 
+@router.get("/leave/summary", response_model=List[LeaveSummaryItem], response_class=ORJSONResponse)
+def get_leave_summary(
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    date_range: Optional[str] = Query(None),
+    user_ids: Optional[List[str]] = Depends(user_ids_filter),
+    db: Session = Depends(get_db),
+    _: User = Depends(require_admin)
+):
+    """Get leave request counts per employee and status (admin only)."""
+    if date_range:
+        from_date, to_date = get_date_range(date_range)
+    elif not from_date or not to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either provide from_date and to_date, or date_range"
+        )
+
+    # Counted in the database so only one row per employee/status comes back
+    stmt = select(
+        User.name,
+        LeaveRequest.status,
+        func.count(LeaveRequest.id).label('leave_count'),
+    ).join(User, LeaveRequest.user_id == User.id).where(
+        LeaveRequest.from_date <= to_date,
+        LeaveRequest.to_date >= from_date,
+        User.role == 'EMPLOYEE',
+    )
+
+    if user_ids:
+        stmt = stmt.where(filter_ids(LeaveRequest.user_id, user_ids))
+
+    stmt = stmt.group_by(User.name, LeaveRequest.status).order_by(User.name, LeaveRequest.status)
+    results = db.execute(stmt).all()
+
+    return ORJSONResponse([
+        {'employee_name': name, 'status': leave_status.value, 'leave_count': leave_count}
+        for name, leave_status, leave_count in results
+    ])
+
+
 @router.get("/export/attendance-excel")
 async def export_attendance_to_excel(
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     date_range: Optional[str] = Query("current_week"),
-    user_ids: Optional[str] = Query(None),
+    user_ids: Optional[List[str]] = Depends(user_ids_filter),
     is_profitable: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+        import xlsxwriter
     except ImportError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="openpyxl library is not installed"
+            detail="xlsxwriter library is not installed"
         )
 
     if date_range and date_range != "custom":
@@ -414,260 +412,58 @@ async def export_attendance_to_excel(
     elif not from_date or not to_date:
         from_date, to_date = get_date_range("current_week")
 
-    # ───────── Users ─────────
-    user_query = db.query(User).filter(
-        User.is_active == True,
-        User.role.in_(["EMPLOYEE", "SUPERVISOR"])
-    )
-
-    if user_ids:
-        uid_list = [u.strip() for u in user_ids.split(",") if u.strip()]
-        if uid_list:
-            user_query = user_query.filter(User.id.in_(uid_list))
-
-    users = user_query.order_by(User.name).all()
-    user_id_strs = [str(u.id) for u in users]
-
-    # ───────── Holidays / Saturdays ─────────
-    holiday_map = {
-        row.holiday_date: row.name
-        for row in db.query(Holiday.holiday_date, Holiday.name).filter(
-            Holiday.holiday_date >= from_date,
-            Holiday.holiday_date <= to_date
-        ).all()
-    }
-
-    working_saturday_set = {
-        row.work_date
-        for row in db.query(WorkingSaturday.work_date).filter(
-            WorkingSaturday.work_date >= from_date,
-            WorkingSaturday.work_date <= to_date
-        ).all()
-    }
-
-    # ───────── Leave Task Master ─────────
-    leave_tm_ids = {
-        row.id for row in db.query(TaskMaster.id).filter(
-            func.lower(TaskMaster.name) == "leave"
-        ).all()
-    }
-
-    from collections import defaultdict
-
-    # ───────── Leave Hours Map ─────────
-    leave_hours_map = defaultdict(float)
-
-    leave_q = db.query(
-        TaskEntry.user_id,
-        TaskEntry.work_date,
-        func.sum(TaskSubEntry.hours).label("total_leave_hours")
-    ).join(
-        TaskSubEntry, TaskEntry.id == TaskSubEntry.task_entry_id
-    ).filter(
-        TaskEntry.work_date >= from_date,
-        TaskEntry.work_date <= to_date,
-        TaskEntry.status == TaskEntryStatus.APPROVED,
-        TaskEntry.user_id.in_(user_id_strs),
-        TaskSubEntry.task_master_id.in_(leave_tm_ids),
-    ).group_by(
-        TaskEntry.user_id,
-        TaskEntry.work_date
-    )
-
-    for row in leave_q.all():
-        leave_hours_map[(str(row.user_id), row.work_date)] = float(row.total_leave_hours or 0)
-
-    # ───────── Entry Map ─────────
-    STATUS_PRIORITY = {
-        TaskEntryStatus.APPROVED: 4,
-        TaskEntryStatus.PENDING: 3,
-        TaskEntryStatus.DRAFT: 2,
-        TaskEntryStatus.REJECTED: 1,
-    }
-
-    entry_map = {}
-
-    for er in db.query(TaskEntry.user_id, TaskEntry.work_date, TaskEntry.status).filter(
-        TaskEntry.work_date >= from_date,
-        TaskEntry.work_date <= to_date,
-        TaskEntry.user_id.in_(user_id_strs)
-    ).all():
-
-        key = (str(er.user_id), er.work_date)
-        if key not in entry_map or STATUS_PRIORITY.get(er.status, 0) > STATUS_PRIORITY.get(entry_map[key], 0):
-            entry_map[key] = er.status
+    def build_workbook():
+        """Assemble the rows and write the workbook; runs on a worker thread."""
+        # The export lists working days only
+        rows = [
+            row for row in build_attendance_rows(db, from_date, to_date, user_ids, is_profitable)
+            if not row.is_non_working_day
+        ]
 
-    # ───────── Production Map ─────────
-    prod_map = defaultdict(lambda: {"production": 0.0, "clients": []})
+        # ───────── Excel Generation ─────────
+        excel_file = open_export_file()
+        wb = xlsxwriter.Workbook(excel_file, {'constant_memory': True})
+        ws = wb.add_worksheet("Attendance Report")
+        formats = add_export_formats(wb)
 
-    prod_q = db.query(
-        TaskEntry.user_id,
-        TaskEntry.work_date,
-        func.coalesce(Client.name, "No Client").label("client_name"),
-        func.sum(TaskSubEntry.production).label("total_production"),
-    ).join(
-        TaskSubEntry, TaskEntry.id == TaskSubEntry.task_entry_id
-    ).outerjoin(
-        Client, TaskSubEntry.client_id == Client.id
-    ).filter(
-        TaskEntry.work_date >= from_date,
-        TaskEntry.work_date <= to_date,
-        TaskEntry.status == TaskEntryStatus.APPROVED,
-        TaskEntry.user_id.in_(user_id_strs),
-    )
+        for first_col, last_col, width in ATTENDANCE_COLUMN_WIDTHS:
+            ws.set_column(first_col, last_col, width)
 
-    if is_profitable is not None:
-        prod_q = prod_q.join(
-            TaskMaster, TaskSubEntry.task_master_id == TaskMaster.id
-        ).filter(TaskMaster.is_profitable == is_profitable)
-
-    prod_q = prod_q.group_by(TaskEntry.user_id, TaskEntry.work_date, Client.name)
-
-    for pr in prod_q.all():
-        key = (str(pr.user_id), pr.work_date)
-        prod_map[key]["production"] += float(pr.total_production or 0)
-        if pr.client_name and pr.client_name not in prod_map[key]["clients"]:
-            prod_map[key]["clients"].append(pr.client_name)
-
-    # ───────── Build Rows ─────────
-    rows = []
-    current_date = from_date
-
-    while current_date <= to_date:
-
-        weekday = current_date.weekday()
-        is_sunday = weekday == 6
-        is_saturday = weekday == 5
-        is_working_saturday = current_date in working_saturday_set
-        in_holiday_map = current_date in holiday_map
-
-        if is_sunday or in_holiday_map or (is_saturday and not is_working_saturday):
-            current_date += timedelta(days=1)
-            continue
-
-        for user in users:
-
-            uid = str(user.id)
-            entry_key = (uid, current_date)
-
-            pd = prod_map.get(entry_key)
-            leave_hours = leave_hours_map.get(entry_key, 0)
-
-            status = "ABSENT"
-            production = None
-            clients = None
-
-            if user.role == "SUPERVISOR":
-                has_production = pd and pd["production"] > 0
-                attendance_status = "PRESENT"
-                production = round(pd["production"], 2) if pd else 0.0
-                client_names_str = ", ".join(pd["clients"]) if pd and pd["clients"] else None
-
-                # Mark as OVERTIME if working on non-working day (weekend/holiday)
-                if is_non_working_day and has_production:
-                    attendance_status = "OVERTIME"
-                elif is_non_working_day and not has_production:
-                    continue  # Skip non-working day records with no production for supervisors
-
-            elif entry_key in entry_map and entry_map[entry_key] == TaskEntryStatus.APPROVED:
-
-                has_production = pd and pd["production"] > 0
-
-                leave_label = None
-                if leave_hours >= 8 or leave_hours > 4:
-                    leave_label = "FULL DAY LEAVE"
-                elif leave_hours > 2:
-                    leave_label = "HALF DAY LEAVE"
-                elif leave_hours > 0:
-                    leave_label = "SHORT LEAVE"
-
-                if has_production:
-                    status = "PRESENT"
-                    production = round(pd["production"], 2)
-                    clients = ", ".join(pd["clients"]) if pd["clients"] else None
-                    if leave_label:
-                        status = leave_label
-                elif leave_label:
-                    status = leave_label
-                else:
-                    status = "ABSENT"
-
-            rows.append({
-                "date": str(current_date),
-                "employee": user.name,
-                "status": status,
-                "production": production,
-                "clients": clients
-            })
-
-        current_date += timedelta(days=1)
-
-    # ───────── Excel Generation ─────────
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Attendance Report"
-
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    border = Border(left=Side(style='thin'), right=Side(style='thin'),
-                    top=Side(style='thin'), bottom=Side(style='thin'))
-
-    headers = ["Date", "Employee", "Status", "Production", "Client(s)"]
-
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.border = border
-
-    row_num = 2
-    for r in rows:
-        values = [r["date"], r["employee"], r["status"],
-                  r["production"] if r["production"] else "",
-                  r["clients"] or ""]
-        for col, val in enumerate(values, 1):
-            cell = ws.cell(row=row_num, column=col, value=val)
-            cell.border = border
-        row_num += 1
+        ws.write_row(0, 0, ATTENDANCE_HEADERS, formats['header'])
 
-    ws.column_dimensions["A"].width = 14
-    ws.column_dimensions["B"].width = 22
-    ws.column_dimensions["C"].width = 28
-    ws.column_dimensions["D"].width = 14
-    ws.column_dimensions["E"].width = 28
+        for row_num, r in enumerate(rows, 1):
+            ws.write_row(row_num, 0, [str(r.date), r.employee_name, r.leave_label or r.attendance_status,
+                                      r.production if r.production else "",
+                                      r.client_names or ""], formats['cell'])
 
-    excel_file = BytesIO()
-    wb.save(excel_file)
-    excel_file.seek(0)
+        wb.close()
+        excel_file.seek(0)
+        return excel_file
 
-    filename = f"attendance_report_{from_date}_{to_date}.xlsx"
+    excel_file = await run_in_threadpool(build_workbook)
 
-    return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return export_file_response(excel_file, f"attachment; filename=attendance_report_{from_date}_{to_date}.xlsx")
 
 @router.get("/export/excel")
 async def export_to_excel(
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     date_range: Optional[str] = Query("this_month"),
-    client_ids: Optional[str] = Query(None),  # Comma-separated UUIDs
-    user_ids: Optional[str] = Query(None),  # Comma-separated UUIDs
-    task_master_ids: Optional[str] = Query(None),  # Comma-separated UUIDs
+    client_ids: Optional[List[str]] = Depends(client_ids_filter),
+    user_ids: Optional[List[str]] = Depends(user_ids_filter),
+    task_master_ids: Optional[List[str]] = Depends(task_master_ids_filter),
     is_profitable: Optional[bool] = Query(None),
+    export_format: str = Query("xlsx", alias="format", pattern="^(xlsx|csv)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    """Export client-wise production report to Excel (admin only)."""
+    """Export client-wise production report to Excel, or CSV for very large ranges (admin only)."""
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+        import xlsxwriter
     except ImportError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="openpyxl library is not installed"
+            detail="xlsxwriter library is not installed"
         )
 
     # Handle date_range filter
@@ -678,12 +474,12 @@ async def export_to_excel(
             from_date, to_date = get_date_range("this_month")
 
     # Query sub-entry level data grouped by client + employee + task
-    query = db.query(
+    stmt = select(
         func.coalesce(Client.name, 'No Client').label('client_name'),
         User.name.label('employee_name'),
         TaskMaster.name.label('task_name'),
-        func.sum(TaskSubEntry.production).label('total_production'),
-        func.sum(TaskSubEntry.hours).label('total_hours'),
+        func.coalesce(func.sum(TaskSubEntry.production), 0).cast(Float).label('total_production'),
+        func.coalesce(func.sum(TaskSubEntry.hours), 0).cast(Float).label('total_hours'),
     ).join(
         TaskEntry, TaskSubEntry.task_entry_id == TaskEntry.id
     ).outerjoin(
@@ -692,7 +488,7 @@ async def export_to_excel(
         TaskMaster, TaskSubEntry.task_master_id == TaskMaster.id
     ).join(
         User, TaskEntry.user_id == User.id
-    ).filter(
+    ).where(
         TaskEntry.work_date >= from_date,
         TaskEntry.work_date <= to_date,
         TaskEntry.status == TaskEntryStatus.APPROVED,
@@ -700,122 +496,92 @@ async def export_to_excel(
     )
 
     if client_ids:
-        client_id_list = [cid.strip() for cid in client_ids.split(',') if cid.strip()]
-        if client_id_list:
-            query = query.filter(TaskSubEntry.client_id.in_(client_id_list))
+        stmt = stmt.where(filter_ids(TaskSubEntry.client_id, client_ids))
 
     if user_ids:
-        user_id_list = [uid.strip() for uid in user_ids.split(',') if uid.strip()]
-        if user_id_list:
-            query = query.filter(TaskEntry.user_id.in_(user_id_list))
+        stmt = stmt.where(filter_ids(TaskEntry.user_id, user_ids))
 
     if task_master_ids:
-        task_master_id_list = [tmid.strip() for tmid in task_master_ids.split(',') if tmid.strip()]
-        if task_master_id_list:
-            query = query.filter(TaskSubEntry.task_master_id.in_(task_master_id_list))
+        stmt = stmt.where(filter_ids(TaskSubEntry.task_master_id, task_master_ids))
 
     if is_profitable is not None:
-        query = query.filter(TaskMaster.is_profitable == is_profitable)
+        stmt = stmt.where(TaskMaster.is_profitable == is_profitable)
 
-    query = query.group_by(
+    stmt = stmt.group_by(
         Client.name, User.name, TaskMaster.name
     ).order_by(Client.name, User.name, TaskMaster.name)
 
-    results = query.all()
-
-    # Build flat row list
-    rows = []
-    for row in results:
-        prod = float(row.total_production or 0)
-        hrs = float(row.total_hours or 0)
-        efficiency = round(prod / hrs, 2) if hrs > 0 else 0
-        rows.append({
-            'client_name': row.client_name,
-            'employee_name': row.employee_name,
-            'task_name': row.task_name,
-            'production': prod,
-            'hours': hrs,
-            'efficiency': efficiency,
-        })
-
-    # ── Excel workbook ──────────────────────────────────────────────────
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Timesheet Report"
-
-    # Styles
-    title_fill   = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-    title_font   = Font(color="FFFFFF", bold=True, size=14)
-    header_fill  = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font  = Font(color="FFFFFF", bold=True)
-    total_fill   = PatternFill(start_color="FFC000", end_color="FFC000", fill_type="solid")
-    total_font   = Font(bold=True, size=12)
-    center       = Alignment(horizontal="center", vertical="center")
-    border       = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'),  bottom=Side(style='thin'),
-    )
+    if export_format == "csv":
+        def build_csv():
+            """Write the plain data rows as CSV; runs on a worker thread."""
+            rows = db.execute(stmt.execution_options(yield_per=EXPORT_YIELD_PER))
+            return write_csv_export(TIMESHEET_HEADERS, (
+                (row.client_name, row.employee_name, row.task_name, row.total_production, row.total_hours,
+                 round(row.total_production / row.total_hours, 2) if row.total_hours > 0 else 0)
+                for row in rows
+            ))
+
+        csv_file = await run_in_threadpool(build_csv)
+        return export_file_response(
+            csv_file, f"attachment; filename=timesheet_report_{from_date}_{to_date}.csv", CSV_MEDIA_TYPE
+        )
+
+    def build_workbook():
+        """Run the query and write the workbook; runs on a worker thread."""
+        # ── Excel workbook ──────────────────────────────────────────────
+        excel_file = open_export_file()
+        wb = xlsxwriter.Workbook(excel_file, {'constant_memory': True})
+        ws = wb.add_worksheet("Timesheet Report")
+        formats = add_export_formats(wb)
+
+        # Column widths must be set before the first row is written
+        for first_col, last_col, width in TIMESHEET_COLUMN_WIDTHS:
+            ws.set_column(first_col, last_col, width)
+
+        last_col = len(TIMESHEET_HEADERS) - 1
+        row_num = 0
 
-    NUM_COLS = 6
-    row_num = 1
-
-    # Title row
-    ws.merge_cells(start_row=row_num, start_column=1, end_row=row_num, end_column=NUM_COLS)
-    tc = ws.cell(row=row_num, column=1, value=f"Timesheet Report: {from_date} to {to_date}")
-    tc.fill, tc.font, tc.alignment = title_fill, title_font, center
-    row_num += 2
-
-    # Column header row
-    headers = ["Client", "Employee", "Task Name", "Production", "Hours", "Efficiency"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=row_num, column=col, value=header)
-        cell.fill, cell.font, cell.alignment, cell.border = header_fill, header_font, center, border
-    row_num += 1
-
-    if not rows:
-        ws.merge_cells(start_row=row_num, start_column=1, end_row=row_num, end_column=NUM_COLS)
-        nd = ws.cell(row=row_num, column=1, value="No data found for the selected date range and filters")
-        nd.alignment = center
-        nd.font = Font(italic=True, size=12)
-    else:
+        # Title row
+        ws.merge_range(row_num, 0, row_num, last_col, f"Timesheet Report: {from_date} to {to_date}", formats['title'])
+        row_num += 2
+
+        # Column header row
+        ws.write_row(row_num, 0, TIMESHEET_HEADERS, formats['header'])
+        row_num += 1
+        first_data_row = row_num
+
+        # Rows are written as they stream in from the database
         grand_production = 0.0
         grand_hours = 0.0
-
-        for r in rows:
-            ws.cell(row=row_num, column=1, value=r['client_name']).border = border
-            ws.cell(row=row_num, column=2, value=r['employee_name']).border = border
-            ws.cell(row=row_num, column=3, value=r['task_name']).border = border
-            ws.cell(row=row_num, column=4, value=r['production']).border = border
-            ws.cell(row=row_num, column=5, value=r['hours']).border = border
-            ws.cell(row=row_num, column=6, value=r['efficiency']).border = border
+        for row in db.execute(stmt.execution_options(yield_per=EXPORT_YIELD_PER)):
+            prod = row.total_production
+            hrs = row.total_hours
+            efficiency = round(prod / hrs, 2) if hrs > 0 else 0
+            ws.write_row(row_num, 0, [
+                row.client_name, row.employee_name, row.task_name, prod, hrs, efficiency,
+            ], formats['cell'])
             row_num += 1
-            grand_production += r['production']
-            grand_hours += r['hours']
+            grand_production += prod
+            grand_hours += hrs
 
-        # Grand total row
-        row_num += 1
-        grand_efficiency = round(grand_production / grand_hours, 2) if grand_hours > 0 else 0
+        if row_num == first_data_row:
+            ws.merge_range(row_num, 0, row_num, last_col,
+                           "No data found for the selected date range and filters", formats['no_data'])
+        else:
+            # Grand total row
+            row_num += 1
+            grand_efficiency = round(grand_production / grand_hours, 2) if grand_hours > 0 else 0
 
-        labels = ["TOTAL", "", "", round(grand_production, 2), round(grand_hours, 2), grand_efficiency]
-        for col, val in enumerate(labels, 1):
-            cell = ws.cell(row=row_num, column=col, value=val)
-            cell.fill, cell.font, cell.alignment, cell.border = total_fill, total_font, center, border
+            labels = ["TOTAL", "", "", round(grand_production, 2), round(grand_hours, 2), grand_efficiency]
+            ws.write_row(row_num, 0, labels, formats['grand_total'])
 
-    # Column widths
-    col_widths = [25, 20, 25, 14, 12, 14]
-    for col, width in zip("ABCDEF", col_widths):
-        ws.column_dimensions[col].width = width
+        wb.close()
+        excel_file.seek(0)
+        return excel_file
 
-    excel_file = BytesIO()
-    wb.save(excel_file)
-    excel_file.seek(0)
+    excel_file = await run_in_threadpool(build_workbook)
 
-    filename = f"timesheet_report_{from_date}_{to_date}.xlsx"
-    return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return export_file_response(excel_file, f"attachment; filename=timesheet_report_{from_date}_{to_date}.xlsx")
 
 
 @router.get("/export/leave-excel")
@@ -823,18 +589,18 @@ async def export_leave_to_excel(
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     date_range: Optional[str] = Query(None),
-    user_ids: Optional[str] = Query(None),  # Comma-separated UUIDs
+    user_ids: Optional[List[str]] = Depends(user_ids_filter),
+    export_format: str = Query("xlsx", alias="format", pattern="^(xlsx|csv)$"),
     db: Session = Depends(get_db),
     _: User = Depends(require_admin)
 ):
-    """Export leave report to Excel (admin only)."""
+    """Export leave report to Excel, or CSV for very large ranges (admin only)."""
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+        import xlsxwriter
     except ImportError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="openpyxl library is not installed"
+            detail="xlsxwriter library is not installed"
         )
 
     # Handle date range
@@ -844,101 +610,78 @@ async def export_leave_to_excel(
         else:
             from_date, to_date = get_date_range("this_month")
 
-    query = db.query(
+    stmt = select(
         LeaveRequest.from_date,
         LeaveRequest.to_date,
         User.name,
-        User.email,
         LeaveRequest.reason,
         LeaveRequest.status,
         LeaveRequest.admin_comment
-    ).join(User, LeaveRequest.user_id == User.id).filter(
+    ).join(User, LeaveRequest.user_id == User.id).where(
         LeaveRequest.from_date <= to_date,
         LeaveRequest.to_date >= from_date,
         User.role == 'EMPLOYEE',
     )
 
     if user_ids:
-        user_id_list = [uid.strip() for uid in user_ids.split(',') if uid.strip()]
-        if user_id_list:
-            query = query.filter(LeaveRequest.user_id.in_(user_id_list))
-
-    results = query.order_by(LeaveRequest.from_date.desc()).all()
-
-    # ── Excel workbook ──────────────────────────────────────────────────
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Leave Report"
-
-    title_fill  = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-    title_font  = Font(color="FFFFFF", bold=True, size=14)
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    center      = Alignment(horizontal="center", vertical="center")
-    border      = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'),  bottom=Side(style='thin'),
-    )
-    approved_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    rejected_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    pending_fill  = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-
-    NUM_COLS = 6
-    row_num = 1
-
-    # Title row
-    ws.merge_cells(start_row=row_num, start_column=1, end_row=row_num, end_column=NUM_COLS)
-    tc = ws.cell(row=row_num, column=1, value=f"Leave Report: {from_date} to {to_date}")
-    tc.fill, tc.font, tc.alignment = title_fill, title_font, center
-    row_num += 2
-
-    # Header row
-    headers = ["Employee", "From", "To", "Reason", "Status", "Admin Comment"]
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=row_num, column=col, value=header)
-        cell.fill, cell.font, cell.alignment, cell.border = header_fill, header_font, center, border
-    row_num += 1
-
-    if not results:
-        ws.merge_cells(start_row=row_num, start_column=1, end_row=row_num, end_column=NUM_COLS)
-        nd = ws.cell(row=row_num, column=1, value="No leave data found for the selected date range and filters")
-        nd.alignment = center
-        nd.font = Font(italic=True, size=12)
-    else:
-        for row in results:
-            status_val = str(row[5].value if hasattr(row[5], 'value') else row[5])
-            row_fill = (
-                approved_fill if status_val == 'APPROVED' else
-                rejected_fill if status_val == 'REJECTED' else
-                pending_fill
-            )
-            cells = [
-                ws.cell(row=row_num, column=1, value=row[2]),
-                ws.cell(row=row_num, column=2, value=str(row[0])),
-                ws.cell(row=row_num, column=3, value=str(row[1])),
-                ws.cell(row=row_num, column=4, value=row[4]),
-                ws.cell(row=row_num, column=5, value=status_val),
-                ws.cell(row=row_num, column=6, value=row[6] or ''),
-            ]
-            for cell in cells:
-                cell.fill = row_fill
-                cell.border = border
-            row_num += 1
+        stmt = stmt.where(filter_ids(LeaveRequest.user_id, user_ids))
 
-    # Column widths
-    for col, width in zip("ABCDEF", [22, 14, 14, 35, 14, 30]):
-        ws.column_dimensions[col].width = width
+    stmt = stmt.order_by(LeaveRequest.from_date.desc())
 
-    excel_file = BytesIO()
-    wb.save(excel_file)
-    excel_file.seek(0)
+    if export_format == "csv":
+        def build_csv():
+            """Write the plain data rows as CSV; runs on a worker thread."""
+            rows = db.execute(stmt.execution_options(yield_per=EXPORT_YIELD_PER))
+            return write_csv_export(LEAVE_HEADERS, (
+                (row[2], row[0], row[1], row[3], row[4].value, row[5] or '') for row in rows
+            ))
 
-    filename = f"leave_report_{from_date}_{to_date}.xlsx"
-    return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+        csv_file = await run_in_threadpool(build_csv)
+        return export_file_response(
+            csv_file, f"attachment; filename=leave_report_{from_date}_{to_date}.csv", CSV_MEDIA_TYPE
+        )
+
+    def build_workbook():
+        """Run the query and write the workbook; runs on a worker thread."""
+        # ── Excel workbook ──────────────────────────────────────────────
+        excel_file = open_export_file()
+        wb = xlsxwriter.Workbook(excel_file, {'constant_memory': True})
+        ws = wb.add_worksheet("Leave Report")
+        formats = add_export_formats(wb)
+
+        # Column widths
+        for first_col, last_col, width in LEAVE_COLUMN_WIDTHS:
+            ws.set_column(first_col, last_col, width)
+
+        # Title row, then a spacer row before the header
+        last_col = len(LEAVE_HEADERS) - 1
+        ws.merge_range(0, 0, 0, last_col, f"Leave Report: {from_date} to {to_date}", formats['title'])
+        ws.write_row(2, 0, LEAVE_HEADERS, formats['header'])
+
+        # Rows are written as they stream in from the database
+        status_formats = {
+            LeaveStatus.APPROVED: formats['approved'],
+            LeaveStatus.REJECTED: formats['rejected'],
+            LeaveStatus.PENDING: formats['pending'],
+        }
+        rows = db.execute(stmt.execution_options(yield_per=EXPORT_YIELD_PER))
+        row_num = None
+        for row_num, row in enumerate(rows, 3):
+            leave_status = row[4]  # SQLEnum column, always a LeaveStatus
+            ws.write_row(row_num, 0, [row[2], row[0], row[1], row[3], leave_status.value, row[5] or ''],
+                         status_formats[leave_status])
+
+        if row_num is None:
+            ws.merge_range(3, 0, 3, last_col, "No leave data found for the selected date range and filters",
+                           formats['no_data'])
+
+        wb.close()
+        excel_file.seek(0)
+        return excel_file
+
+    excel_file = await run_in_threadpool(build_workbook)
+
+    return export_file_response(excel_file, f"attachment; filename=leave_report_{from_date}_{to_date}.xlsx")
 
 
 # User Reports Router (for non-admin users)
@@ -950,8 +693,8 @@ def get_my_timesheet_report(
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     date_range: Optional[str] = Query(None),
-    client_ids: Optional[str] = Query(None),  # Comma-separated UUIDs
-    task_master_ids: Optional[str] = Query(None),  # Comma-separated UUIDs
+    client_ids: Optional[List[str]] = Depends(client_ids_filter),
+    task_master_ids: Optional[List[str]] = Depends(task_master_ids_filter),
     is_profitable: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -966,7 +709,7 @@ def get_my_timesheet_report(
             detail="Either provide from_date and to_date, or date_range"
         )
     
-    query = db.query(
+    stmt = select(
         TaskEntry.work_date,
         User.name,
         User.email,
@@ -978,7 +721,7 @@ def get_my_timesheet_report(
     ).join(User, TaskEntry.user_id == User.id).outerjoin(
         Client,
         TaskEntry.client_id == Client.id  # LEFT JOIN to include leave entries
-    ).filter(
+    ).where(
         TaskEntry.work_date >= from_date,
         TaskEntry.work_date <= to_date,
         TaskEntry.user_id == current_user.id  # Only current user's entries
@@ -986,23 +729,21 @@ def get_my_timesheet_report(
     
     # Multi-select filters
     if client_ids:
-        client_id_list = [cid.strip() for cid in client_ids.split(',') if cid.strip()]
-        if client_id_list:
-            query = query.filter(TaskEntry.client_id.in_(client_id_list))
+        stmt = stmt.where(filter_ids(TaskEntry.client_id, client_ids))
     
-    if task_master_ids:
-        task_master_id_list = [tmid.strip() for tmid in task_master_ids.split(',') if tmid.strip()]
-        if task_master_id_list:
-            query = query.join(TaskSubEntry, TaskEntry.id == TaskSubEntry.task_entry_id)
-            query = query.filter(TaskSubEntry.task_master_id.in_(task_master_id_list))
-    
-    if is_profitable is not None:
-        if not task_master_ids:  # Only join if not already joined
-            query = query.join(TaskSubEntry, TaskEntry.id == TaskSubEntry.task_entry_id)
-        query = query.join(TaskMaster, TaskSubEntry.task_master_id == TaskMaster.id)
-        query = query.filter(TaskMaster.is_profitable == is_profitable)
+    # Sub-entry filters go through one EXISTS so each entry is returned once,
+    # however many of its sub-entries match
+    if task_master_ids or is_profitable is not None:
+        sub_entry_match = select(TaskSubEntry.id).where(TaskSubEntry.task_entry_id == TaskEntry.id)
+        if task_master_ids:
+            sub_entry_match = sub_entry_match.where(filter_ids(TaskSubEntry.task_master_id, task_master_ids))
+        if is_profitable is not None:
+            sub_entry_match = sub_entry_match.join(
+                TaskMaster, TaskSubEntry.task_master_id == TaskMaster.id
+            ).where(TaskMaster.is_profitable == is_profitable)
+        stmt = stmt.where(sub_entry_match.exists())
     
-    results = query.order_by(TaskEntry.work_date.desc()).all()
+    results = db.execute(stmt.order_by(TaskEntry.work_date.desc())).all()
     
     return [
         TimesheetReportItem(
@@ -1024,22 +765,21 @@ async def export_my_report_to_excel(
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     date_range: Optional[str] = Query("this_month"),
-    client_ids: Optional[str] = Query(None),
-    task_master_ids: Optional[str] = Query(None),
+    client_ids: Optional[List[str]] = Depends(client_ids_filter),
+    task_master_ids: Optional[List[str]] = Depends(task_master_ids_filter),
     is_profitable: Optional[bool] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Export current user's productivity report to Excel."""
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+        import xlsxwriter
     except ImportError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="openpyxl library is not installed"
+            detail="xlsxwriter library is not installed"
         )
-    
+
     # Handle date_range filter
     if not from_date or not to_date:
         # If dates not provided, use date_range (but skip "custom")
@@ -1050,18 +790,18 @@ async def export_my_report_to_excel(
             from_date, to_date = get_date_range("this_month")
     
     # Query for user's data (using TaskSubEntry.client_id)
-    query = db.query(
+    stmt = select(
         func.coalesce(Client.name, 'No Client').label('client_name'),
         TaskMaster.name.label('task_name'),
-        func.sum(TaskSubEntry.production).label('total_production'),
-        func.sum(TaskSubEntry.hours).label('total_hours')
+        func.coalesce(func.sum(TaskSubEntry.production), 0).cast(Float).label('total_production'),
+        func.coalesce(func.sum(TaskSubEntry.hours), 0).cast(Float).label('total_hours')
     ).join(
         TaskEntry, TaskSubEntry.task_entry_id == TaskEntry.id
     ).outerjoin(
         Client, TaskSubEntry.client_id == Client.id  # Use TaskSubEntry.client_id with LEFT JOIN
     ).join(
         TaskMaster, TaskSubEntry.task_master_id == TaskMaster.id
-    ).filter(
+    ).where(
         TaskEntry.work_date >= from_date,
         TaskEntry.work_date <= to_date,
         TaskEntry.status == TaskEntryStatus.APPROVED,
@@ -1070,181 +810,90 @@ async def export_my_report_to_excel(
     
     # Multi-select filters
     if client_ids:
-        client_id_list = [cid.strip() for cid in client_ids.split(',') if cid.strip()]
-        if client_id_list:
-            query = query.filter(TaskSubEntry.client_id.in_(client_id_list))
+        stmt = stmt.where(filter_ids(TaskSubEntry.client_id, client_ids))
     
     if task_master_ids:
-        task_master_id_list = [tmid.strip() for tmid in task_master_ids.split(',') if tmid.strip()]
-        if task_master_id_list:
-            query = query.filter(TaskSubEntry.task_master_id.in_(task_master_id_list))
+        stmt = stmt.where(filter_ids(TaskSubEntry.task_master_id, task_master_ids))
     
     if is_profitable is not None:
-        query = query.filter(TaskMaster.is_profitable == is_profitable)
-    
-    query = query.group_by(Client.name, TaskMaster.name).order_by(Client.name, TaskMaster.name)
-    
-    results = query.all()
-    
-    # Group by client
-    from collections import defaultdict
-    client_data = defaultdict(list)
-    for row in results:
-        client_data[row.client_name].append({
-            'task_name': row.task_name,
-            'production': float(row.total_production or 0),
-            'hours': float(row.total_hours or 0)
-        })
-    
-    # Create Excel workbook (reuse same styling as admin export)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "My Productivity Report"
-    
-    # Styling
-    title_fill = PatternFill(start_color="1F4E78", end_color="1F4E78", fill_type="solid")
-    title_font = Font(color="FFFFFF", bold=True, size=14)
-    
-    client_header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    client_header_font = Font(color="FFFFFF", bold=True, size=12)
-    
-    column_header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    column_header_font = Font(color="FFFFFF", bold=True)
-    header_alignment = Alignment(horizontal="center", vertical="center")
-    
-    border_style = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+        stmt = stmt.where(TaskMaster.is_profitable == is_profitable)
     
-    row_num = 1
+    stmt = stmt.group_by(Client.name, TaskMaster.name).order_by(Client.name, TaskMaster.name)
     
-    # Add title row
-    ws.merge_cells(start_row=row_num, start_column=1, end_row=row_num, end_column=4)
-    title_cell = ws.cell(row=row_num, column=1, value=f"My Productivity Report: {from_date} to {to_date}")
-    title_cell.fill = title_fill
-    title_cell.font = title_font
-    title_cell.alignment = header_alignment
-    row_num += 2
-    
-    # Check if there's any data
-    if not client_data:
-        ws.merge_cells(start_row=row_num, start_column=1, end_row=row_num, end_column=4)
-        no_data_cell = ws.cell(row=row_num, column=1, value="No data found for the selected filters")
-        no_data_cell.alignment = header_alignment
-        no_data_cell.font = Font(italic=True, size=12)
+    def build_workbook():
+        """Run the query and write the report into a spooled file; runs on a worker thread."""
+        # Rows stream in sorted by client, so consecutive rows form each client
+        # group and only one group is held in memory at a time
+        rows = db.execute(stmt.execution_options(yield_per=EXPORT_YIELD_PER))
+        client_groups = groupby(rows, key=attrgetter('client_name'))
+        first_group = next(client_groups, None)
+
+        # Create a constant-memory workbook (reuse same styling as admin export)
+        excel_file = open_export_file()
+        wb = xlsxwriter.Workbook(excel_file, {'constant_memory': True})
+        ws = wb.add_worksheet("My Productivity Report")
+
+        formats = add_export_formats(wb)
+
+        for first_col, last_col, width in MY_REPORT_COLUMN_WIDTHS:
+            ws.set_column(first_col, last_col, width)
+
+        row_num = 0
+
+        # Add title row
+        ws.merge_range(row_num, 0, row_num, 3, f"My Productivity Report: {from_date} to {to_date}", formats['title'])
         row_num += 2
-        
-        headers = ["Task Name", "Production", "Hours", "Efficiency"]
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_num, column=col_num, value=header)
-            cell.fill = column_header_fill
-            cell.font = column_header_font
-            cell.alignment = header_alignment
-            cell.border = border_style
-    else:
-        # Styling for subtotal rows
-        subtotal_fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
-        subtotal_font = Font(bold=True, size=11)
-        
-        # Styling for grand total
-        grand_total_fill = PatternFill(start_color="FFC000", end_color="FFC000", fill_type="solid")
-        grand_total_font = Font(bold=True, size=12)
-        
-        grand_total_production = 0
-        
-        for client_name, tasks in client_data.items():
-            ws.merge_cells(start_row=row_num, start_column=1, end_row=row_num, end_column=4)
-            client_cell = ws.cell(row=row_num, column=1, value=client_name)
-            client_cell.fill = client_header_fill
-            client_cell.font = client_header_font
-            client_cell.alignment = header_alignment
-            row_num += 1
-            
-            headers = ["Task Name", "Production", "Hours", "Efficiency"]
-            for col_num, header in enumerate(headers, 1):
-                cell = ws.cell(row=row_num, column=col_num, value=header)
-                cell.fill = column_header_fill
-                cell.font = column_header_font
-                cell.alignment = header_alignment
-                cell.border = border_style
-            row_num += 1
-            
-            # Calculate client subtotal
-            client_total_production = 0
-            client_total_hours = 0
-            
-            for task in tasks:
-                efficiency = (task['production'] / task['hours']) if task['hours'] > 0 else 0
-                
-                ws.cell(row=row_num, column=1, value=task['task_name']).border = border_style
-                ws.cell(row=row_num, column=2, value=task['production']).border = border_style
-                ws.cell(row=row_num, column=3, value=task['hours']).border = border_style
-                ws.cell(row=row_num, column=4, value=round(efficiency, 2)).border = border_style
+
+        # Check if there's any data
+        if first_group is None:
+            ws.merge_range(row_num, 0, row_num, 3, "No data found for the selected filters", formats['no_data'])
+            row_num += 2
+
+            ws.write_row(row_num, 0, MY_REPORT_HEADERS, formats['header'])
+        else:
+            client_totals = []
+
+            for client_name, group in chain((first_group,), client_groups):
+                # Split the group into parallel name/production/hours columns
+                names, prods, hours = zip(*((row.task_name, row.total_production, row.total_hours) for row in group))
+
+                ws.merge_range(row_num, 0, row_num, 3, client_name, formats['client_header'])
                 row_num += 1
-                
-                client_total_production += task['production']
-                client_total_hours += task['hours']
-            
-            # Add Production Sub Total row for this client
-            subtotal_cell = ws.cell(row=row_num, column=1, value="Production Sub Total")
-            subtotal_cell.fill = subtotal_fill
-            subtotal_cell.font = subtotal_font
-            subtotal_cell.border = border_style
-            
-            production_cell = ws.cell(row=row_num, column=2, value=round(client_total_production, 2))
-            production_cell.fill = subtotal_fill
-            production_cell.font = subtotal_font
-            production_cell.border = border_style
-            
-            hours_cell = ws.cell(row=row_num, column=3, value=round(client_total_hours, 2))
-            hours_cell.fill = subtotal_fill
-            hours_cell.font = subtotal_font
-            hours_cell.border = border_style
-            
-            client_efficiency = (client_total_production / client_total_hours) if client_total_hours > 0 else 0
-            efficiency_cell = ws.cell(row=row_num, column=4, value=round(client_efficiency, 2))
-            efficiency_cell.fill = subtotal_fill
-            efficiency_cell.font = subtotal_font
-            efficiency_cell.border = border_style
-            
-            row_num += 1
-            
-            # Add to grand total
-            grand_total_production += client_total_production
-            
-            row_num += 1
-        
-        # Add Total Production at the end
-        row_num += 1  # Extra spacing before grand total
-        ws.merge_cells(start_row=row_num, start_column=1, end_row=row_num, end_column=1)
-        total_label_cell = ws.cell(row=row_num, column=1, value="TOTAL PRODUCTION")
-        total_label_cell.fill = grand_total_fill
-        total_label_cell.font = grand_total_font
-        total_label_cell.alignment = header_alignment
-        total_label_cell.border = border_style
-        
-        total_value_cell = ws.cell(row=row_num, column=2, value=round(grand_total_production, 2))
-        total_value_cell.fill = grand_total_fill
-        total_value_cell.font = grand_total_font
-        total_value_cell.alignment = header_alignment
-        total_value_cell.border = border_style
-    
-    ws.column_dimensions['A'].width = 30
-    ws.column_dimensions['B'].width = 15
-    ws.column_dimensions['C'].width = 15
-    ws.column_dimensions['D'].width = 15
-    
-    excel_file = BytesIO()
-    wb.save(excel_file)
-    excel_file.seek(0)
-    
-    filename = f"my_productivity_report_{from_date}_{to_date}.xlsx"
-    
-    return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+
+                ws.write_row(row_num, 0, MY_REPORT_HEADERS, formats['header'])
+                row_num += 1
+
+                effs, client_total_production, client_total_hours = aggregate_productivity(prods, hours)
+
+                # Data rows are written unformatted; one conditional-format rule
+                # borders the whole block instead of a format per cell
+                data_start = row_num
+                for name, prod, hrs, efficiency in zip(names, prods, hours, effs):
+                    ws.write_row(row_num, 0, [name, prod, hrs, efficiency])
+                    row_num += 1
+                ws.conditional_format(data_start, 0, row_num - 1, 3, {'type': 'no_blanks', 'format': formats['cell']})
+
+                # Add Production Sub Total row for this client
+                client_efficiency = (client_total_production / client_total_hours) if client_total_hours > 0 else 0
+                ws.write_row(row_num, 0, [
+                    "Production Sub Total",
+                    *(round(value, 2) for value in (client_total_production, client_total_hours, client_efficiency)),
+                ], formats['subtotal'])
+                row_num += 1
+
+                client_totals.append(client_total_production)
+
+                row_num += 1
+
+            # Add Total Production at the end
+            row_num += 1  # Extra spacing before grand total
+            grand_total_production = fsum(client_totals)
+            ws.write_row(row_num, 0, ["TOTAL PRODUCTION", round(grand_total_production, 2)], formats['grand_total'])
+
+        wb.close()
+        excel_file.seek(0)
+        return excel_file
+
+    excel_file = await run_in_threadpool(build_workbook)
+
+    return export_file_response(excel_file, MY_REPORT_DISPOSITION % (from_date, to_date))
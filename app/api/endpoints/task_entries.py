@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, select
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload, selectinload
+from sqlalchemy import exists, insert, or_, select
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import uuid
 from uuid import UUID
@@ -10,31 +12,45 @@ from app.db.session import get_db
 from app.models.user import User
 from app.models.task_entry import TaskEntry, TaskSubEntry, TaskEntryStatus
 from app.models.leave_request import LeaveRequest, LeaveStatus
-from app.models.client import Client
+from app.models.client import Client, ClientStatus
 from app.models.task_master import TaskMaster
-from app.models.working_saturday import WorkingSaturday
-from app.models.holiday import Holiday
 from app.schemas import TaskEntryCreate, TaskEntryUpdate, TaskEntryResponse, DeletionRequestCreate, AdminTaskEntryCreate
-from app.api.dependencies import get_current_user, require_admin
+from app.schemas import ClientResponse, TaskMasterResponse, TaskSubEntryResponse, UserResponse
+from app.api.dependencies import get_current_user, require_admin, user_ids_filter, client_ids_filter
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, seek_after
+from app.services.calendar_cache import is_holiday, is_working_saturday
 
 router = APIRouter(prefix="/task-entries", tags=["Task Entries"])
 
 
-def is_holiday(work_date: date, db: Session) -> bool:
-    """Check if the given date is a defined holiday."""
-    holiday = db.query(Holiday).filter(Holiday.holiday_date == work_date).first()
-    return holiday is not None
+def is_weekend(work_date: date) -> bool:
+    """Check if the given date is a weekend (Saturday or Sunday)."""
+    return work_date.weekday() >= 5  # 5 = Saturday, 6 = Sunday
 
 
-def is_working_saturday(work_date: date, db: Session) -> bool:
-    """Check if the given date is a defined working Saturday."""
-    ws = db.query(WorkingSaturday).filter(WorkingSaturday.work_date == work_date).first()
-    return ws is not None
+def parse_cursor(cursor: str, parsers) -> list:
+    """Decode a list cursor, rejecting malformed ones with 422."""
+    try:
+        return decode_cursor(cursor, parsers)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid cursor"
+        )
 
 
-def is_weekend(work_date: date) -> bool:
-    """Check if the given date is a weekend (Saturday or Sunday)."""
-    return work_date.weekday() in [5, 6]  # 5 = Saturday, 6 = Sunday
+EIGHT = Decimal(8)
+ZERO = Decimal(0)
+
+# (non-working day, sign of hours - 8) -> hours -> (status, is_overtime, overtime_hours)
+STATUS_TABLE = {
+    (True, -1): lambda hours: (TaskEntryStatus.PENDING, True, hours),
+    (True, 0): lambda hours: (TaskEntryStatus.PENDING, True, hours),
+    (True, 1): lambda hours: (TaskEntryStatus.PENDING, True, hours),
+    (False, -1): lambda hours: (TaskEntryStatus.PENDING, False, ZERO),
+    (False, 0): lambda hours: (TaskEntryStatus.APPROVED, False, ZERO),
+    (False, 1): lambda hours: (TaskEntryStatus.PENDING, True, hours - EIGHT),
+}
 
 
 def calculate_task_status(work_date: date, total_hours: Decimal, db: Session) -> tuple[TaskEntryStatus, bool, Decimal]:
@@ -53,43 +69,123 @@ def calculate_task_status(work_date: date, total_hours: Decimal, db: Session) ->
 
     A working day is: Mon-Fri (not holiday), or designated working Saturday (not holiday)
     A non-working day is: Holiday, Sunday, or Saturday (non-designated)
+
+    The rules are encoded in STATUS_TABLE.
     """
     weekday = work_date.weekday()
-    is_sat = weekday == 5
-    is_sun = weekday == 6
-    is_hol = is_holiday(work_date, db)
-    is_work_sat = is_sat and is_working_saturday(work_date, db)
+    is_non_working_day = (
+        weekday == 6
+        or is_holiday(work_date, db)
+        or (weekday == 5 and not is_working_saturday(work_date, db))
+    )
+    hours_cmp = (total_hours > EIGHT) - (total_hours < EIGHT)
+
+    return STATUS_TABLE[(is_non_working_day, hours_cmp)](total_hours)
+
+
+LEAVE_KEYWORDS = ('leave', 'sick', 'vacation', 'absent', 'holiday', 'off day', 'time off')
+
+
+def is_leave_task_master(task_master: TaskMaster) -> bool:
+    """Check if a task master is a leave task (for client requirement logic).
+
+    Non-profitable task masters are leave; otherwise fall back to the name.
+    """
+    if task_master.is_profitable is False:
+        return True
+    name = task_master.name.lower()
+    return any(keyword in name for keyword in LEAVE_KEYWORDS)
+
+
+def response_columns(model, schema) -> list:
+    """Mapped columns of `model` that `schema` serializes, for load_only()."""
+    column_keys = model.__mapper__.column_attrs.keys()
+    return [getattr(model, name) for name in schema.model_fields if name in column_keys]
+
+
+# Everything TaskEntryResponse serializes: single-row relationships are joined,
+# sub-entries come in one IN query so a page is not multiplied by their count.
+# Columns are limited to the response fields (no password hashes or audit ids);
+# raiseload('*') makes any relationship left off this list fail instead of lazy loading
+TASK_ENTRY_RESPONSE_OPTIONS = (
+    load_only(*response_columns(TaskEntry, TaskEntryResponse)),
+    joinedload(TaskEntry.user).load_only(*response_columns(User, UserResponse)),
+    joinedload(TaskEntry.client).load_only(*response_columns(Client, ClientResponse)),
+    joinedload(TaskEntry.approver).load_only(*response_columns(User, UserResponse)),
+    selectinload(TaskEntry.sub_entries).options(
+        load_only(*response_columns(TaskSubEntry, TaskSubEntryResponse)),
+        joinedload(TaskSubEntry.client).load_only(*response_columns(Client, ClientResponse)),
+        joinedload(TaskSubEntry.task_master).load_only(*response_columns(TaskMaster, TaskMasterResponse)),
+    ),
+    raiseload('*'),
+)
+
+
+def load_task_masters(sub_entries, db: Session) -> dict[str, TaskMaster]:
+    """Fetch the task masters referenced by the sub-entries in one query, keyed by id."""
+    task_master_ids = {str(sub.task_master_id) for sub in sub_entries}
+    if not task_master_ids:
+        return {}
+    return {
+        task_master.id: task_master
+        for task_master in db.query(TaskMaster).filter(TaskMaster.id.in_(task_master_ids))
+    }
+
 
-    # Determine if this is a non-working day (HIGHEST PRIORITY CHECK)
-    # Non-working: Holiday, Sunday, or Saturday without working Saturday designation
-    is_non_working_day = is_hol or is_sun or (is_sat and not is_work_sat)
+def sync_sub_entries(task_entry_id: str, rows: List[dict], db: Session):
+    """
+    Bring a task entry's sub-entries in line with `rows`, writing only what changed.
 
-    # Priority 1: Non-working day — ALWAYS requires admin approval, all hours are overtime
-    if is_non_working_day:
-        return TaskEntryStatus.PENDING, True, total_hours
+    Rows carrying the id of an existing sub-entry update it in place, other rows
+    are inserted, and existing sub-entries missing from `rows` are deleted.
+    """
+    existing = {
+        sub_entry.id: sub_entry
+        for sub_entry in db.query(TaskSubEntry).filter(TaskSubEntry.task_entry_id == task_entry_id)
+    }
+    new_rows = []
+    for row in rows:
+        sub_entry = existing.pop(row.pop("id"), None)
+        if sub_entry is None:
+            new_rows.append(row)
+            continue
+        for field, value in row.items():
+            if getattr(sub_entry, field) != value:
+                setattr(sub_entry, field, value)
 
-    # From here: working day (Mon-Fri non-holiday, or designated working Saturday)
+    if existing:
+        db.query(TaskSubEntry).filter(
+            TaskSubEntry.id.in_(existing)
+        ).delete(synchronize_session=False)
+    if new_rows:
+        db.bulk_insert_mappings(TaskSubEntry, new_rows, render_nulls=True)
 
-    # Priority 2: Exactly 8 hours on a working day — auto-approved
-    if total_hours == 8:
-        return TaskEntryStatus.APPROVED, False, Decimal(0)
 
-    # Priority 3: More than 8 hours on a working day — overtime, requires approval
-    if total_hours > 8:
-        return TaskEntryStatus.PENDING, True, total_hours - Decimal(8)
+def reload_task_entry(task_entry_id: str, db: Session) -> TaskEntry:
+    """Reload a committed task entry with its response relationships eager-loaded."""
+    return db.query(TaskEntry).options(*TASK_ENTRY_RESPONSE_OPTIONS).populate_existing().filter(
+        TaskEntry.id == task_entry_id
+    ).one()
 
-    # Priority 4: Less than 8 hours on a working day — requires approval
-    return TaskEntryStatus.PENDING, False, Decimal(0)
 
+def is_duplicate_work_date(exc: IntegrityError) -> bool:
+    """Check if an insert failed on uq_user_work_date (one entry per user per day).
 
-@router.get("", response_model=List[TaskEntryResponse])
+    MySQL and PostgreSQL both name the violated constraint in the driver error.
+    """
+    return "uq_user_work_date" in str(exc.orig)
+
+
+@router.get("", response_model=List[TaskEntryResponse], response_class=ORJSONResponse)
 def list_task_entries(
+    response: Response,
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     status_filter: Optional[TaskEntryStatus] = Query(None, alias="status"),
-    client_ids: Optional[str] = Query(None, description="Comma-separated list of client IDs"),
+    client_ids: Optional[List[str]] = Depends(client_ids_filter),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=f"Opaque {NEXT_CURSOR_HEADER} value from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -100,14 +196,14 @@ def list_task_entries(
     - Date range filtering (from_date, to_date)
     - Status filtering (status)
     - Multiple client filtering (client_ids as comma-separated)
-    - Pagination (skip, limit)
+    - Pagination (limit with cursor, or legacy skip)
+
+    When a page is full, the X-Next-Cursor header carries the cursor for the
+    next page; passing it seeks past the last row instead of using OFFSET.
     """
+    sort_columns = (TaskEntry.work_date, TaskEntry.id)
     query = db.query(TaskEntry).filter(TaskEntry.user_id == current_user.id).options(
-        joinedload(TaskEntry.user),
-        joinedload(TaskEntry.client),
-        joinedload(TaskEntry.approver),
-        joinedload(TaskEntry.sub_entries).joinedload(TaskSubEntry.client),
-        joinedload(TaskEntry.sub_entries).joinedload(TaskSubEntry.task_master)
+        *TASK_ENTRY_RESPONSE_OPTIONS
     )
     
     # Date range filtering
@@ -122,36 +218,45 @@ def list_task_entries(
     
     # Multiple clients filtering - check both main client and sub-entry clients
     if client_ids:
-        client_id_list = [cid.strip() for cid in client_ids.split(',') if cid.strip()]
-        if client_id_list:
-            # Create a subquery to find task entries that have sub-entries with matching clients
-            subquery = db.query(TaskSubEntry.task_entry_id).filter(
-                TaskSubEntry.client_id.in_(client_id_list)
-            ).distinct().subquery()
-            
-            # Filter to include entries where either:
-            # 1. Main client_id matches, OR
-            # 2. Has a sub-entry with matching client_id
-            query = query.filter(
-                or_(
-                    TaskEntry.client_id.in_(client_id_list),
-                    TaskEntry.id.in_(db.query(subquery.c.task_entry_id))
-                )
+        # Create a subquery to find task entries that have sub-entries with matching clients
+        subquery = db.query(TaskSubEntry.task_entry_id).filter(
+            TaskSubEntry.client_id.in_(client_ids)
+        ).distinct().subquery()
+        
+        # Filter to include entries where either:
+        # 1. Main client_id matches, OR
+        # 2. Has a sub-entry with matching client_id
+        query = query.filter(
+            or_(
+                TaskEntry.client_id.in_(client_ids),
+                TaskEntry.id.in_(db.query(subquery.c.task_entry_id))
             )
+        )
     
-    task_entries = query.order_by(TaskEntry.work_date.desc()).offset(skip).limit(limit).all()
+    query = query.order_by(*(column.desc() for column in sort_columns))
+    if cursor:
+        query = query.filter(seek_after(sort_columns, parse_cursor(cursor, (date.fromisoformat, str))))
+    elif skip:
+        query = query.offset(skip)
+
+    task_entries = query.limit(limit).all()
+    if task_entries and len(task_entries) == limit:
+        last = task_entries[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor((last.work_date, last.id))
     return task_entries
 
 
-@router.get("/admin/all", response_model=List[TaskEntryResponse])
+@router.get("/admin/all", response_model=List[TaskEntryResponse], response_class=ORJSONResponse)
 def admin_list_all_task_entries(
+    response: Response,
     from_date: Optional[date] = Query(None),
     to_date: Optional[date] = Query(None),
     status_filter: Optional[TaskEntryStatus] = Query(None, alias="status"),
-    user_ids: Optional[str] = Query(None, description="Comma-separated list of user IDs"),
-    client_ids: Optional[str] = Query(None, description="Comma-separated list of client IDs"),
+    user_ids: Optional[List[str]] = Depends(user_ids_filter),
+    client_ids: Optional[List[str]] = Depends(client_ids_filter),
     skip: int = 0,
     limit: int = 1000,
+    cursor: Optional[str] = Query(None, description=f"Opaque {NEXT_CURSOR_HEADER} value from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
@@ -163,14 +268,11 @@ def admin_list_all_task_entries(
     - Status filtering (status)
     - Multiple user filtering (user_ids as comma-separated)
     - Multiple client filtering (client_ids as comma-separated)
-    - Pagination (skip, limit)
+    - Pagination (limit with cursor, or legacy skip)
     """
+    sort_columns = (TaskEntry.work_date, TaskEntry.created_at, TaskEntry.id)
     query = db.query(TaskEntry).options(
-        joinedload(TaskEntry.user),
-        joinedload(TaskEntry.client),
-        joinedload(TaskEntry.approver),
-        joinedload(TaskEntry.sub_entries).joinedload(TaskSubEntry.client),
-        joinedload(TaskEntry.sub_entries).joinedload(TaskSubEntry.task_master)
+        *TASK_ENTRY_RESPONSE_OPTIONS
     )
     
     # Date range filtering
@@ -185,32 +287,38 @@ def admin_list_all_task_entries(
     
     # Multiple users filtering
     if user_ids:
-        user_id_list = [uid.strip() for uid in user_ids.split(',') if uid.strip()]
-        if user_id_list:
-            query = query.filter(TaskEntry.user_id.in_(user_id_list))
+        query = query.filter(TaskEntry.user_id.in_(user_ids))
     
     # Multiple clients filtering - check both main client and sub-entry clients
     if client_ids:
-        client_id_list = [cid.strip() for cid in client_ids.split(',') if cid.strip()]
-        if client_id_list:
-            # Create a subquery to find task entries that have sub-entries with matching clients
-            subquery = db.query(TaskSubEntry.task_entry_id).filter(
-                TaskSubEntry.client_id.in_(client_id_list)
-            ).distinct().subquery()
-            
-            # Filter to include entries where either:
-            # 1. Main client_id matches, OR
-            # 2. Has a sub-entry with matching client_id
-            query = query.filter(
-                or_(
-                    TaskEntry.client_id.in_(client_id_list),
-                    TaskEntry.id.in_(db.query(subquery.c.task_entry_id))
-                )
+        # Create a subquery to find task entries that have sub-entries with matching clients
+        subquery = db.query(TaskSubEntry.task_entry_id).filter(
+            TaskSubEntry.client_id.in_(client_ids)
+        ).distinct().subquery()
+        
+        # Filter to include entries where either:
+        # 1. Main client_id matches, OR
+        # 2. Has a sub-entry with matching client_id
+        query = query.filter(
+            or_(
+                TaskEntry.client_id.in_(client_ids),
+                TaskEntry.id.in_(db.query(subquery.c.task_entry_id))
             )
+        )
     
-    query = query.order_by(TaskEntry.work_date.desc(), TaskEntry.created_at.desc())
-    
-    return query.offset(skip).limit(limit).all()
+    query = query.order_by(*(column.desc() for column in sort_columns))
+    if cursor:
+        query = query.filter(seek_after(
+            sort_columns, parse_cursor(cursor, (date.fromisoformat, datetime.fromisoformat, str))
+        ))
+    elif skip:
+        query = query.offset(skip)
+
+    task_entries = query.limit(limit).all()
+    if task_entries and len(task_entries) == limit:
+        last = task_entries[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor((last.work_date, last.created_at, last.id))
+    return task_entries
 
 
 @router.post("", response_model=TaskEntryResponse, status_code=status.HTTP_201_CREATED)
@@ -221,10 +329,12 @@ def create_task_entry(
 ):
     """Create a new task entry with per-sub-task client tracking."""
     
+    task_masters = load_task_masters(task_entry_create.sub_entries, db)
+
     # Helper functions to categorize task types
     def get_task_master(task_master_id: str) -> Optional[TaskMaster]:
-        """Fetch task master from database."""
-        return db.query(TaskMaster).filter(TaskMaster.id == task_master_id).first()
+        """Look up a prefetched task master."""
+        return task_masters.get(task_master_id)
     
     def requires_hours_only(task_name: str) -> bool:
         """Tasks that only require hours (no production)."""
@@ -238,23 +348,17 @@ def create_task_entry(
         task_lower = task_name.lower()
         return 'gp task' in task_lower
     
-    def is_leave_task(task_master_id: str) -> bool:
-        """Check if task is a leave task (for client requirement logic)."""
-        task_master = get_task_master(task_master_id)
-        if not task_master:
-            return False
-        
-        # Method 1: Check is_profitable field (most reliable)
-        if hasattr(task_master, 'is_profitable') and task_master.is_profitable is False:
-            return True
-        
-        # Method 2: Check name for leave-related keywords (backup)
-        task_name_lower = task_master.name.lower()
-        return any(keyword in task_name_lower for keyword in ['leave', 'sick', 'vacation', 'absent', 'holiday', 'off day', 'time off'])
-    
-    # Validate sub-entries based on task type requirements
+    # Single pass over sub-entries: validate task type requirements, collect
+    # NON-LEAVE clients, total the hours and build the sub-entry rows
+    task_entry_id = str(uuid.uuid4())
+    client_id_strs = set()
+    total_hours = ZERO
+    first_client_id = None
+    sub_entry_rows = []
     for sub in task_entry_create.sub_entries:
-        task_master = get_task_master(str(sub.task_master_id))
+        task_master_id = str(sub.task_master_id)
+        client_id = str(sub.client_id) if sub.client_id else None
+        task_master = get_task_master(task_master_id)
         if not task_master:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -288,19 +392,30 @@ def create_task_entry(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Task '{task_name}' does not require hours value"
                 )
+        
+        if client_id is not None:
+            if first_client_id is None:
+                first_client_id = client_id
+            if not is_leave_task_master(task_master):
+                client_id_strs.add(client_id)
+        total_hours += sub.hours
+        
+        # Sub-entry with its own client; productive comes from is_profitable
+        sub_entry_rows.append({
+            "task_entry_id": task_entry_id,
+            "client_id": client_id,
+            "title": sub.title,
+            "description": sub.description,
+            "hours": sub.hours,
+            "productive": task_master.is_profitable,
+            "production": sub.production,
+            "task_master_id": task_master_id,
+        })
     
     # Validate all NON-LEAVE clients in sub-entries exist, are active, and have ACTIVE status
-    client_ids = {
-        sub.client_id for sub in task_entry_create.sub_entries 
-        if sub.client_id is not None and not is_leave_task(str(sub.task_master_id))
-    }
-    if client_ids:
-        # Convert UUIDs to strings for database query (Client.id is String type)
-        client_id_strs = {str(cid) for cid in client_ids}
-        
+    if client_id_strs:
         # Only restrict users from adding entries for clients with INACTIVE status
-        from app.models.client import ClientStatus
-        all_clients = db.query(Client).filter(
+        all_clients = db.query(Client.id, Client.name, Client.status).filter(
             Client.id.in_(client_id_strs),
             Client.is_active == True
         ).all()
@@ -323,33 +438,22 @@ def create_task_entry(
                 detail=f"Cannot add entries for inactive clients: {', '.join(inactive_status_clients)}. Please contact admin to activate these clients."
             )
     
-    # Check if task entry already exists for this date
-    existing = db.query(TaskEntry).filter(
-        TaskEntry.user_id == current_user.id,
-        TaskEntry.work_date == task_entry_create.work_date
-    ).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Task entry already exists for this date"
+    # Check if approved leave exists for this date; an existing entry for the
+    # date is rejected by the uq_user_work_date constraint on insert
+    has_leave = db.query(
+        exists().where(
+            LeaveRequest.user_id == current_user.id,
+            LeaveRequest.status == LeaveStatus.APPROVED,
+            LeaveRequest.from_date <= task_entry_create.work_date,
+            LeaveRequest.to_date >= task_entry_create.work_date
         )
-    
-    # Check if approved leave exists for this date
-    leave = db.query(LeaveRequest).filter(
-        LeaveRequest.user_id == current_user.id,
-        LeaveRequest.status == LeaveStatus.APPROVED,
-        LeaveRequest.from_date <= task_entry_create.work_date,
-        LeaveRequest.to_date >= task_entry_create.work_date
-    ).first()
-    if leave:
+    ).scalar()
+    if has_leave:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot create task entry on a date with approved leave"
         )
     
-    # Calculate total hours
-    total_hours = sum(sub.hours for sub in task_entry_create.sub_entries)
-    
     # Calculate status and overtime based on date and hours
     entry_status, is_overtime, overtime_hours = calculate_task_status(
         task_entry_create.work_date, 
@@ -357,51 +461,38 @@ def create_task_entry(
         db
     )
     
-    # Create task entry (client_id is optional now, defaults to first non-None sub-entry client)
-    first_client_id = next((sub.client_id for sub in task_entry_create.sub_entries if sub.client_id is not None), None)
-    task_entry = TaskEntry(
-        user_id=current_user.id,
-        client_id=str(task_entry_create.client_id) if task_entry_create.client_id else (str(first_client_id) if first_client_id else None),
-        work_date=task_entry_create.work_date,
-        task_name=task_entry_create.task_name,
-        description=task_entry_create.description,
-        total_hours=total_hours,
-        status=entry_status,
-        is_overtime=is_overtime,
-        overtime_hours=overtime_hours,
-        created_by=current_user.id,
-        updated_by=current_user.id
-    )
-    
-    db.add(task_entry)
-    db.flush()
-    
-    # Create sub-entries with individual client tracking
-    for sub_data in task_entry_create.sub_entries:
-        # Get task master to determine if productive
-        task_master = db.query(TaskMaster).filter(TaskMaster.id == str(sub_data.task_master_id)).first()
-        if not task_master:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Task master not found: {sub_data.task_master_id}"
-            )
-        
-        # Create sub-entry with client_id (convert UUID to string)
-        sub_entry = TaskSubEntry(
-            task_entry_id=task_entry.id,
-            client_id=str(sub_data.client_id) if sub_data.client_id else None,
-            title=sub_data.title,
-            description=sub_data.description,
-            hours=sub_data.hours,
-            productive=task_master.is_profitable,  # Auto-set from task master
-            production=sub_data.production,
-            task_master_id=str(sub_data.task_master_id)
+    # Create task entry (client_id is optional now, defaults to first non-None sub-entry client).
+    # A plain INSERT is enough here: the id is generated above and the response is reloaded.
+    try:
+        db.execute(insert(TaskEntry).values(
+            id=task_entry_id,
+            user_id=current_user.id,
+            client_id=str(task_entry_create.client_id) if task_entry_create.client_id else first_client_id,
+            work_date=task_entry_create.work_date,
+            task_name=task_entry_create.task_name,
+            description=task_entry_create.description,
+            total_hours=total_hours,
+            status=entry_status,
+            is_overtime=is_overtime,
+            overtime_hours=overtime_hours,
+            created_by=current_user.id,
+            updated_by=current_user.id
+        ))
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_duplicate_work_date(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Task entry already exists for this date"
         )
-        db.add(sub_entry)
+    
+    # Create sub-entries with individual client tracking in a single INSERT;
+    # render_nulls keeps rows without a client in the same executemany batch
+    db.bulk_insert_mappings(TaskSubEntry, sub_entry_rows, render_nulls=True)
     
     db.commit()
-    db.refresh(task_entry)
-    return task_entry
+    return reload_task_entry(task_entry_id, db)
 
 
 @router.get("/{task_entry_id}", response_model=TaskEntryResponse)
@@ -417,8 +508,10 @@ def get_task_entry(
     ).options(
         joinedload(TaskEntry.user),
         joinedload(TaskEntry.client),
+        joinedload(TaskEntry.approver),
         joinedload(TaskEntry.sub_entries).joinedload(TaskSubEntry.client),
-        joinedload(TaskEntry.sub_entries).joinedload(TaskSubEntry.task_master)
+        joinedload(TaskEntry.sub_entries).joinedload(TaskSubEntry.task_master),
+        raiseload('*')
     ).first()
     
     if not task_entry:
@@ -438,12 +531,9 @@ def update_task_entry(
     current_user: User = Depends(get_current_user)
 ):
     """Update a task entry (only if DRAFT or PENDING)."""
-    task_entry = db.query(TaskEntry).filter(
-        TaskEntry.id == task_entry_id,
-        TaskEntry.user_id == current_user.id
-    ).first()
+    task_entry = db.get(TaskEntry, task_entry_id)
     
-    if not task_entry:
+    if not task_entry or task_entry.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task entry not found"
@@ -476,14 +566,15 @@ def update_task_entry(
             task_lower = task_name.lower()
             return 'gp task' in task_lower
         
-        # Delete existing sub-entries
-        db.query(TaskSubEntry).filter(TaskSubEntry.task_entry_id == task_entry.id).delete()
+        task_masters = load_task_masters(task_entry_update.sub_entries, db)
         
-        # Create new sub-entries and calculate total hours
-        total_hours = Decimal(0)
+        # Validate sub-entries and calculate total hours
+        total_hours = ZERO
+        sub_entry_rows = []
         for sub_data in task_entry_update.sub_entries:
+            task_master_id = str(sub_data.task_master_id)
             # Get task master to determine if productive
-            task_master = db.query(TaskMaster).filter(TaskMaster.id == str(sub_data.task_master_id)).first()
+            task_master = task_masters.get(task_master_id)
             if not task_master:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -519,19 +610,21 @@ def update_task_entry(
                     )
             
             # Auto-set productive based on task master's is_profitable
-            sub_entry = TaskSubEntry(
-                task_entry_id=task_entry.id,
-                title=sub_data.title,
-                description=sub_data.description,
-                hours=sub_data.hours,
-                productive=task_master.is_profitable,  # Auto-set from task master
-                production=sub_data.production,
-                task_master_id=str(sub_data.task_master_id),
-                client_id=str(sub_data.client_id) if sub_data.client_id else None
-            )
-            db.add(sub_entry)
+            sub_entry_rows.append({
+                "id": str(sub_data.id) if sub_data.id else None,
+                "task_entry_id": task_entry.id,
+                "title": sub_data.title,
+                "description": sub_data.description,
+                "hours": sub_data.hours,
+                "productive": task_master.is_profitable,  # Auto-set from task master
+                "production": sub_data.production,
+                "task_master_id": task_master_id,
+                "client_id": str(sub_data.client_id) if sub_data.client_id else None,
+            })
             total_hours += sub_data.hours
         
+        # Update matching sub-entries in place, insert new ones, delete the rest
+        sync_sub_entries(task_entry.id, sub_entry_rows, db)
         task_entry.total_hours = total_hours
 
         # Recalculate status and overtime using the same logic as when creating
@@ -560,8 +653,7 @@ def update_task_entry(
     task_entry.updated_by = current_user.id
     
     db.commit()
-    db.refresh(task_entry)
-    return task_entry
+    return reload_task_entry(task_entry_id, db)
 
 
 @router.post("/{task_entry_id}/submit", response_model=TaskEntryResponse)
@@ -571,12 +663,9 @@ def submit_task_entry(
     current_user: User = Depends(get_current_user)
 ):
     """Submit a task entry for approval."""
-    task_entry = db.query(TaskEntry).filter(
-        TaskEntry.id == task_entry_id,
-        TaskEntry.user_id == current_user.id
-    ).first()
+    task_entry = db.get(TaskEntry, task_entry_id)
     
-    if not task_entry:
+    if not task_entry or task_entry.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task entry not found"
@@ -593,8 +682,7 @@ def submit_task_entry(
     task_entry.updated_by = current_user.id
     
     db.commit()
-    db.refresh(task_entry)
-    return task_entry
+    return reload_task_entry(task_entry_id, db)
 
 
 @router.delete("/{task_entry_id}", response_model=TaskEntryResponse)
@@ -605,12 +693,9 @@ def request_task_entry_deletion(
     deletion_request: Optional[DeletionRequestCreate] = Body(None)
 ):
     """Request deletion of a task entry. Requires admin approval before actual deletion."""
-    task_entry = db.query(TaskEntry).filter(
-        TaskEntry.id == task_entry_id,
-        TaskEntry.user_id == current_user.id
-    ).first()
+    task_entry = db.get(TaskEntry, task_entry_id)
 
-    if not task_entry:
+    if not task_entry or task_entry.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task entry not found"
@@ -631,8 +716,7 @@ def request_task_entry_deletion(
     task_entry.updated_by = current_user.id
 
     db.commit()
-    db.refresh(task_entry)
-    return task_entry
+    return reload_task_entry(task_entry_id, db)
 
 
 @router.post("/{task_entry_id}/cancel-deletion", response_model=TaskEntryResponse)
@@ -642,12 +726,9 @@ def cancel_deletion_request(
     current_user: User = Depends(get_current_user)
 ):
     """Cancel a pending deletion request and restore the entry to its previous status."""
-    task_entry = db.query(TaskEntry).filter(
-        TaskEntry.id == task_entry_id,
-        TaskEntry.user_id == current_user.id
-    ).first()
+    task_entry = db.get(TaskEntry, task_entry_id)
 
-    if not task_entry:
+    if not task_entry or task_entry.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task entry not found"
@@ -668,8 +749,7 @@ def cancel_deletion_request(
     task_entry.updated_by = current_user.id
 
     db.commit()
-    db.refresh(task_entry)
-    return task_entry
+    return reload_task_entry(task_entry_id, db)
 
 
 @router.delete("/admin/{task_entry_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -679,7 +759,7 @@ def admin_delete_task_entry(
     current_user: User = Depends(require_admin)
 ):
     """Admin: Delete any task entry regardless of status."""
-    task_entry = db.query(TaskEntry).filter(TaskEntry.id == task_entry_id).first()
+    task_entry = db.get(TaskEntry, task_entry_id)
     
     if not task_entry:
         raise HTTPException(
@@ -700,7 +780,7 @@ def admin_update_task_entry(
     current_user: User = Depends(require_admin)
 ):
     """Admin: Update any task entry regardless of status."""
-    task_entry = db.query(TaskEntry).filter(TaskEntry.id == task_entry_id).first()
+    task_entry = db.get(TaskEntry, task_entry_id)
     
     if not task_entry:
         raise HTTPException(
@@ -731,17 +811,15 @@ def admin_update_task_entry(
             task_lower = task_name.lower()
             return 'gp task' in task_lower
         
-        # Delete old sub-entries
-        for sub in task_entry.sub_entries:
-            db.delete(sub)
+        task_masters = load_task_masters(task_entry_update.sub_entries, db)
         
-        # Create new sub-entries
-        total_hours = 0
+        # Validate sub-entries and calculate total hours
+        total_hours = ZERO
+        sub_entry_rows = []
         for sub_data in task_entry_update.sub_entries:
+            task_master_id = str(sub_data.task_master_id)
             # Get task master to determine productive status
-            task_master = db.query(TaskMaster).filter(
-                TaskMaster.id == str(sub_data.task_master_id)
-            ).first()
+            task_master = task_masters.get(task_master_id)
             
             if not task_master:
                 raise HTTPException(
@@ -777,27 +855,27 @@ def admin_update_task_entry(
                         detail=f"Task '{task_name}' does not require hours value"
                     )
             
-            sub_entry = TaskSubEntry(
-                id=str(uuid.uuid4()),
-                task_entry_id=task_entry.id,
-                client_id=str(sub_data.client_id) if sub_data.client_id else None,
-                task_master_id=str(sub_data.task_master_id),
-                title=sub_data.title,
-                description=sub_data.description,
-                hours=sub_data.hours,
-                productive=task_master.is_profitable if hasattr(task_master, 'is_profitable') else True,
-                production=sub_data.production
-            )
-            db.add(sub_entry)
-            total_hours += float(sub_data.hours)
+            sub_entry_rows.append({
+                "id": str(sub_data.id) if sub_data.id else None,
+                "task_entry_id": task_entry.id,
+                "client_id": str(sub_data.client_id) if sub_data.client_id else None,
+                "task_master_id": task_master_id,
+                "title": sub_data.title,
+                "description": sub_data.description,
+                "hours": sub_data.hours,
+                "productive": task_master.is_profitable,
+                "production": sub_data.production,
+            })
+            total_hours += sub_data.hours
         
+        # Update matching sub-entries in place, insert new ones, delete the rest
+        sync_sub_entries(task_entry.id, sub_entry_rows, db)
         task_entry.total_hours = total_hours
 
     task_entry.updated_by = current_user.id
 
     db.commit()
-    db.refresh(task_entry)
-    return task_entry
+    return reload_task_entry(task_entry_id, db)
 
 
 @router.post("/admin/create", response_model=TaskEntryResponse, status_code=status.HTTP_201_CREATED)
@@ -816,8 +894,10 @@ def admin_create_task_entry_for_user(
             detail="User not found"
         )
 
+    task_masters = load_task_masters(task_entry_create.sub_entries, db)
+
     def get_task_master(task_master_id: str) -> Optional[TaskMaster]:
-        return db.query(TaskMaster).filter(TaskMaster.id == task_master_id).first()
+        return task_masters.get(task_master_id)
 
     def requires_hours_only(task_name: str) -> bool:
         task_lower = task_name.lower()
@@ -828,18 +908,10 @@ def admin_create_task_entry_for_user(
     def requires_production_only(task_name: str) -> bool:
         return 'gp task' in task_name.lower()
 
-    def is_leave_task(task_master_id: str) -> bool:
-        task_master = get_task_master(task_master_id)
-        if not task_master:
-            return False
-        if hasattr(task_master, 'is_profitable') and task_master.is_profitable is False:
-            return True
-        return any(k in task_master.name.lower() for k in [
-            'leave', 'sick', 'vacation', 'absent', 'holiday', 'off day', 'time off'
-        ])
-
-    # Validate sub-entries
+    # Validate sub-entries and total their hours
+    total_hours = ZERO
     for sub in task_entry_create.sub_entries:
+        total_hours += sub.hours
         task_master = get_task_master(str(sub.task_master_id))
         if not task_master:
             raise HTTPException(
@@ -865,12 +937,11 @@ def admin_create_task_entry_for_user(
     # Validate non-leave clients
     client_ids = {
         sub.client_id for sub in task_entry_create.sub_entries
-        if sub.client_id is not None and not is_leave_task(str(sub.task_master_id))
+        if sub.client_id is not None and not is_leave_task_master(get_task_master(str(sub.task_master_id)))
     }
     if client_ids:
-        from app.models.client import ClientStatus
         client_id_strs = {str(cid) for cid in client_ids}
-        all_clients = db.query(Client).filter(
+        all_clients = db.query(Client.id, Client.name, Client.status).filter(
             Client.id.in_(client_id_strs), Client.is_active == True
         ).all()
         missing = client_id_strs - {c.id for c in all_clients}
@@ -882,18 +953,6 @@ def admin_create_task_entry_for_user(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                                 detail=f"Cannot add entries for inactive clients: {', '.join(inactive)}")
 
-    # Check for duplicate entry on same date for the target user
-    existing = db.query(TaskEntry).filter(
-        TaskEntry.user_id == target_user.id,
-        TaskEntry.work_date == task_entry_create.work_date
-    ).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"A task entry already exists for {target_user.name} on {task_entry_create.work_date}"
-        )
-
-    total_hours = sum(sub.hours for sub in task_entry_create.sub_entries)
     entry_status, is_overtime, overtime_hours = calculate_task_status(
         task_entry_create.work_date, total_hours, db
     )
@@ -917,25 +976,32 @@ def admin_create_task_entry_for_user(
         updated_by=current_user.id
     )
     db.add(task_entry)
-    db.flush()
-
-    for sub_data in task_entry_create.sub_entries:
-        task_master = db.query(TaskMaster).filter(TaskMaster.id == str(sub_data.task_master_id)).first()
-        if not task_master:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                                detail=f"Task master not found: {sub_data.task_master_id}")
-        sub_entry = TaskSubEntry(
-            task_entry_id=task_entry.id,
-            client_id=str(sub_data.client_id) if sub_data.client_id else None,
-            title=sub_data.title,
-            description=sub_data.description,
-            hours=sub_data.hours,
-            productive=task_master.is_profitable,
-            production=sub_data.production,
-            task_master_id=str(sub_data.task_master_id)
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_duplicate_work_date(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A task entry already exists for {target_user.name} on {task_entry_create.work_date}"
         )
-        db.add(sub_entry)
+
+    # Task masters were validated above; insert all sub-entries in one statement
+    task_entry_id = task_entry.id
+    db.bulk_insert_mappings(TaskSubEntry, [
+        {
+            "task_entry_id": task_entry_id,
+            "client_id": str(sub_data.client_id) if sub_data.client_id else None,
+            "title": sub_data.title,
+            "description": sub_data.description,
+            "hours": sub_data.hours,
+            "productive": task_masters[str(sub_data.task_master_id)].is_profitable,
+            "production": sub_data.production,
+            "task_master_id": str(sub_data.task_master_id),
+        }
+        for sub_data in task_entry_create.sub_entries
+    ], render_nulls=True)
 
     db.commit()
-    db.refresh(task_entry)
-    return task_entry
+    return reload_task_entry(task_entry_id, db)
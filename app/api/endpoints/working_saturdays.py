@@ -9,6 +9,7 @@ from app.models.user import User, UserRole
 from app.models.working_saturday import WorkingSaturday
 from app.schemas import WorkingSaturdayCreate, WorkingSaturdayResponse
 from app.api.dependencies import get_current_user, require_admin
+from app.services.calendar_cache import invalidate_calendar, is_working_saturday
 
 router = APIRouter(prefix="/admin/working-saturdays", tags=["Working Saturdays"])
 
@@ -73,6 +74,7 @@ def create_working_saturday(
     
     db.add(ws)
     db.commit()
+    invalidate_calendar()
     db.refresh(ws)
     return ws
 
@@ -134,6 +136,7 @@ def update_working_saturday(
     ws.description = working_saturday_update.description
     
     db.commit()
+    invalidate_calendar()
     db.refresh(ws)
     return ws
 
@@ -154,6 +157,7 @@ def delete_working_saturday(
     
     db.delete(ws)
     db.commit()
+    invalidate_calendar()
     return None
 
 
@@ -169,17 +173,16 @@ def check_working_saturday(
     """
     # Check if it's a weekend (Saturday = 5, Sunday = 6)
     weekday = work_date.weekday()
-    is_weekend = weekday in [5, 6]
+    is_weekend = weekday >= 5
     
     # Check if it's a working Saturday
-    ws = db.query(WorkingSaturday).filter(WorkingSaturday.work_date == work_date).first()
-    is_working_saturday = ws is not None
+    working_saturday = is_working_saturday(work_date, db)
     
     return {
         "date": work_date,
         "is_weekend": is_weekend,
         "is_saturday": weekday == 5,
         "is_sunday": weekday == 6,
-        "is_working_saturday": is_working_saturday,
-        "requires_approval": is_weekend and not is_working_saturday
+        "is_working_saturday": working_saturday,
+        "requires_approval": is_weekend and not working_saturday
     }
@@ -7,6 +7,13 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+
+    # Connection pool, sized for sync endpoints and exports on the threadpool
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    # Compiled statement cache entries per engine; every filter combination of
+    # the list endpoints is its own entry, so allow headroom over the default 500
+    DB_QUERY_CACHE_SIZE: int = 1200
     
     # SMTP Configuration for Password Reset
     SMTP_HOST: Optional[str] = None
@@ -16,6 +23,10 @@ class Settings(BaseSettings):
     SMTP_FROM_EMAIL: Optional[str] = "noreply@ideoshift.com"
     SMTP_FROM_NAME: Optional[str] = "Ideoshift"
     FRONTEND_URL: Optional[str] = "http://localhost:3000"
+
+    # Optional nginx X-Accel-Redirect offload for Excel downloads
+    EXPORT_ACCEL_DIR: Optional[str] = None
+    EXPORT_ACCEL_LOCATION: str = "/internal-exports/"
     
     class Config:
         env_file = ".env"
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta, date
+from functools import lru_cache
 from typing import Tuple
 
 
@@ -16,8 +17,13 @@ def get_date_range(filter_type: str) -> Tuple[date, date]:
     - 'this_year': First to last day of current year
     - 'last_year': First to last day of previous year
     """
-    today = date.today()
-    
+    # Keyed on today's date so cached ranges roll over at midnight
+    return _date_range_for(filter_type, date.today())
+
+
+@lru_cache(maxsize=64)
+def _date_range_for(filter_type: str, today: date) -> Tuple[date, date]:
+    """Compute the range for filter_type relative to today."""
     if filter_type == 'today':
         return (today, today)
     
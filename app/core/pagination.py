@@ -0,0 +1,48 @@
+import base64
+import json
+from typing import Any, Callable, List, Sequence
+
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    payload = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[str], Any]]) -> List[Any]:
+    """Decode a cursor back into typed sort key values.
+
+    Raises ValueError when the cursor is malformed or does not match `parsers`.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    if (
+        not isinstance(values, list)
+        or len(values) != len(parsers)
+        or not all(isinstance(value, str) for value in values)
+    ):
+        raise ValueError("Malformed cursor")
+    try:
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+
+
+def seek_after(columns: Sequence[Any], values: Sequence[Any]):
+    """Build a filter for rows after `values` in descending `columns` order.
+
+    Expanded as (a < x) OR (a = x AND b < y) ... rather than a row-value
+    comparison, so MySQL can range-scan the leading index column.
+    """
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, column < value))
+    return or_(*clauses)
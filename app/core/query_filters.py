@@ -0,0 +1,23 @@
+from typing import List, Optional, Union
+
+
+def parse_csv_ids(values: Union[str, List[str], None]) -> Optional[List[str]]:
+    """Flatten an id filter given as repeated params, comma-separated values, or both.
+
+    The common single-id case skips the split entirely.
+    """
+    if not values:
+        return None
+    if isinstance(values, str):
+        values = [values]
+    if len(values) == 1 and ',' not in values[0]:
+        value = values[0].strip()
+        return [value] if value else None
+    return [item.strip() for value in values for item in value.split(',') if item.strip()] or None
+
+
+def filter_ids(column, ids: List[str]):
+    """Build an id filter, using plain equality for single-select filters."""
+    if len(ids) == 1:
+        return column == ids[0]
+    return column.in_(ids)
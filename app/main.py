@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.endpoints import auth, users, clients, task_entries, leave_requests, approvals, reports, task_masters, dashboard, profile, working_saturdays, holidays, bulk_upload
+from app.core.pagination import NEXT_CURSOR_HEADER
 
 app = FastAPI(
     title="Timesheet & Attendance Management System",
@@ -20,6 +21,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
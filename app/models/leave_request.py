@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, DateTime, ForeignKey, Enum as SQLEnum, Float
+from sqlalchemy import Column, String, Date, DateTime, ForeignKey, Enum as SQLEnum, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -38,6 +38,14 @@ class LeaveRequest(Base):
     created_by = Column(String(36), nullable=True)
     updated_by = Column(String(36), nullable=True)
 
+    # Overlap lookups (from_date <= :to AND to_date >= :from) range-scan
+    # to_date and check from_date from the same index; per-user approved-leave
+    # checks seek on user_id and status and answer from the dates in the index
+    __table_args__ = (
+        Index('ix_leave_requests_to_date_from_date', 'to_date', 'from_date'),
+        Index('ix_leave_requests_user_status_dates', 'user_id', 'status', 'from_date', 'to_date'),
+    )
+
     # Relationships
     user = relationship("User", back_populates="leave_requests", foreign_keys=[user_id])
     approver = relationship("User", foreign_keys=[approved_by])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, Numeric, DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint, Boolean
+from sqlalchemy import Column, String, Date, Numeric, DateTime, ForeignKey, Enum as SQLEnum, UniqueConstraint, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -44,14 +44,20 @@ class TaskEntry(Base):
     updated_by = Column(String(36), nullable=True)
 
     # Unique constraint: one task entry per user per day
+    # Composite index: per-user report queries filter on status and a work_date range
+    # Admin list index: matches its (work_date, created_at, id) keyset order
     __table_args__ = (
         UniqueConstraint('user_id', 'work_date', name='uq_user_work_date'),
+        Index('ix_task_entries_user_status_work_date', 'user_id', 'status', 'work_date'),
+        Index('ix_task_entries_work_date_created_at_id', 'work_date', 'created_at', 'id'),
     )
 
     # Relationships
     user = relationship("User", back_populates="task_entries", foreign_keys=[user_id])
     client = relationship("Client", back_populates="task_entries")
-    sub_entries = relationship("TaskSubEntry", back_populates="task_entry", cascade="all, delete-orphan")
+    # passive_deletes: the task_entry_id FK cascades, so deleting an entry
+    # does not first load and delete its sub-entries row by row
+    sub_entries = relationship("TaskSubEntry", back_populates="task_entry", cascade="all, delete-orphan", passive_deletes=True)
     approver = relationship("User", foreign_keys=[approved_by])
 
 
@@ -71,6 +77,13 @@ class TaskSubEntry(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # Composite indexes: sub-entry loads and deletes go by parent entry,
+    # client filters look up parent entries by sub-entry client
+    __table_args__ = (
+        Index('ix_task_sub_entries_task_entry_client', 'task_entry_id', 'client_id'),
+        Index('ix_task_sub_entries_client_task_entry', 'client_id', 'task_entry_id'),
+    )
+
     # Relationships
     task_entry = relationship("TaskEntry", back_populates="sub_entries")
     client = relationship("Client")  # NEW: Direct relationship to client
@@ -159,6 +159,10 @@ class TaskSubEntryCreate(TaskSubEntryBase):
     task_master_id: UUID  # Required for new entries
 
 
+class TaskSubEntryUpdate(TaskSubEntryCreate):
+    id: Optional[UUID] = None  # Existing sub-entry to update in place; omit to add one
+
+
 class TaskSubEntryResponse(TaskSubEntryBase):
     id: UUID
     task_entry_id: UUID
@@ -211,7 +215,7 @@ class TaskEntryUpdate(BaseModel):
     task_name: Optional[str] = None
     description: Optional[str] = None
     client_id: Optional[UUID] = None
-    sub_entries: Optional[List[TaskSubEntryCreate]] = None
+    sub_entries: Optional[List[TaskSubEntryUpdate]] = None
 
     @validator('sub_entries')
     def validate_hours_or_production(cls, v):
@@ -365,6 +369,12 @@ class LeaveReportItem(BaseModel):
     reason: str
     status: LeaveStatus
     admin_comment: Optional[str]
+
+
+class LeaveSummaryItem(BaseModel):
+    employee_name: str
+    status: LeaveStatus
+    leave_count: int
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
 from uuid import UUID
@@ -0,0 +1,263 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, bindparam, case, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.query_filters import filter_ids
+from app.models.client import Client
+from app.models.holiday import Holiday
+from app.models.task_entry import TaskEntry, TaskEntryStatus, TaskSubEntry
+from app.models.task_master import TaskMaster
+from app.models.user import User
+from app.models.working_saturday import WorkingSaturday
+
+
+@dataclass(slots=True)
+class AttendanceRow:
+    """One employee-day of the attendance report."""
+    date: date
+    employee_name: str
+    employee_email: str
+    attendance_status: str
+    production: Optional[float] = None
+    client_names: Optional[str] = None
+    leave_hours: float = 0
+    is_full_day_leave: bool = False
+    is_half_day_leave: bool = False
+    is_short_leave: bool = False
+    is_non_working_day: bool = False
+
+    @property
+    def leave_label(self) -> Optional[str]:
+        if self.is_full_day_leave:
+            return "FULL DAY LEAVE"
+        if self.is_half_day_leave:
+            return "HALF DAY LEAVE"
+        if self.is_short_leave:
+            return "SHORT LEAVE"
+        return None
+
+
+# Report statements are built once at import with bound parameters, so each
+# request only binds values instead of rebuilding and re-keying the query.
+
+# Holidays and working Saturdays come back in one UNION ALL, tagged by source
+CALENDAR_STMT = union_all(
+    select(Holiday.holiday_date.label("day"), literal("holiday").label("kind")).where(
+        Holiday.holiday_date >= bindparam("from_date"),
+        Holiday.holiday_date <= bindparam("to_date")
+    ),
+    select(WorkingSaturday.work_date, literal("working_saturday")).where(
+        WorkingSaturday.work_date >= bindparam("from_date"),
+        WorkingSaturday.work_date <= bindparam("to_date")
+    ),
+)
+
+
+def _entry_aggregates_stmt(filter_profitable: bool):
+    """One grouped query over entries and their sub-entries.
+
+    Conditional sums pick out leave hours and approved production, the latter
+    optionally limited to task masters matching :is_profitable.
+    """
+    is_approved = TaskEntry.status == TaskEntryStatus.APPROVED
+    is_leave_sub = and_(is_approved, func.lower(TaskMaster.name) == "leave")
+    counts_production = and_(
+        is_approved, TaskMaster.is_profitable == bindparam("is_profitable")
+    ) if filter_profitable else is_approved
+
+    return select(
+        TaskEntry.user_id,
+        TaskEntry.work_date,
+        TaskEntry.status,
+        func.coalesce(Client.name, "No Client").label("client_name"),
+        func.sum(case((is_leave_sub, TaskSubEntry.hours))).label("leave_hours"),
+        func.sum(case((counts_production, TaskSubEntry.production))).label("total_production"),
+        func.count(case((counts_production, TaskSubEntry.id))).label("production_subs"),
+    ).outerjoin(
+        TaskSubEntry, TaskEntry.id == TaskSubEntry.task_entry_id
+    ).outerjoin(
+        Client, TaskSubEntry.client_id == Client.id
+    ).outerjoin(
+        TaskMaster, TaskSubEntry.task_master_id == TaskMaster.id
+    ).where(
+        TaskEntry.work_date >= bindparam("from_date"),
+        TaskEntry.work_date <= bindparam("to_date"),
+        TaskEntry.user_id.in_(bindparam("user_ids", expanding=True)),
+    ).group_by(
+        TaskEntry.user_id,
+        TaskEntry.work_date,
+        TaskEntry.status,
+        Client.name
+    )
+
+
+ENTRY_AGGREGATES_STMT = _entry_aggregates_stmt(filter_profitable=False)
+PROFITABLE_ENTRY_AGGREGATES_STMT = _entry_aggregates_stmt(filter_profitable=True)
+
+
+def is_off_day(day: date, holiday_dates, working_saturday_set) -> bool:
+    """Sundays, holidays and Saturdays not marked as working are non-working."""
+    weekday = day.weekday()
+    return weekday == 6 or day in holiday_dates or (weekday == 5 and day not in working_saturday_set)
+
+
+def build_attendance_rows(
+    db: Session,
+    from_date: date,
+    to_date: date,
+    user_ids: Optional[List[str]] = None,
+    is_profitable: Optional[bool] = None,
+) -> List[AttendanceRow]:
+    """Assemble the attendance report for active employees and supervisors.
+
+    Every working day yields a row per user from their joining date on.
+    Non-working days only yield rows for users who logged production there
+    (marked OVERTIME) or took leave.
+    """
+    # ── Load Users ────────────────────────────────────────────────
+    user_query = db.query(User.id, User.name, User.email, User.role, User.joining_date).filter(
+        User.is_active == True,
+        User.role.in_(["EMPLOYEE", "SUPERVISOR"])
+    )
+    if user_ids:
+        user_query = user_query.filter(filter_ids(User.id, user_ids))
+
+    users = user_query.order_by(User.name).all()
+    user_id_list = [u.id for u in users]
+
+    params = {"from_date": from_date, "to_date": to_date}
+
+    # ── Holidays / Working Saturdays ────────────────────────────
+    calendar_rows = db.execute(CALENDAR_STMT, params).all()
+    holiday_dates = frozenset(day for day, kind in calendar_rows if kind == "holiday")
+    working_saturday_set = frozenset(day for day, kind in calendar_rows if kind == "working_saturday")
+
+    # ── Entry Aggregates (leave hours, status, production) ──────
+    leave_hours_map = defaultdict(float)
+    entry_map = {}
+    prod_map = defaultdict(lambda: {"production": 0.0, "clients": set()})
+
+    if is_profitable is None:
+        agg_rows = db.execute(ENTRY_AGGREGATES_STMT, {**params, "user_ids": user_id_list}).all()
+    else:
+        agg_rows = db.execute(
+            PROFITABLE_ENTRY_AGGREGATES_STMT,
+            {**params, "user_ids": user_id_list, "is_profitable": is_profitable}
+        ).all()
+
+    for row in agg_rows:
+        key = (row.user_id, row.work_date)
+
+        # uq_user_work_date allows one entry per user and day, so every
+        # client row of a key carries the same status
+        entry_map[key] = row.status
+
+        if row.leave_hours:
+            leave_hours_map[key] += float(row.leave_hours)
+
+        if row.production_subs:
+            prod_map[key]["production"] += float(row.total_production or 0)
+            if row.client_name:
+                prod_map[key]["clients"].add(row.client_name)
+
+    # ── Report Days ──────────────────────────────────────────────
+    report_days = [
+        (day, is_off_day(day, holiday_dates, working_saturday_set))
+        for day in (from_date + timedelta(days=offset) for offset in range((to_date - from_date).days + 1))
+    ]
+
+    # ── User Metadata ────────────────────────────────────────────
+    user_rows = [
+        (
+            u.id, u.name, u.email, u.role == "SUPERVISOR",
+            u.joining_date.date() if u.joining_date else None,
+        )
+        for u in users
+    ]
+
+    # ── Build Report ─────────────────────────────────────────────
+    rows = []
+    for current_date, non_working_day in report_days:
+
+        for uid, uname, uemail, is_supervisor, joined_on in user_rows:
+
+            entry_key = (uid, current_date)
+
+            # Skip records before user's joining date
+            if joined_on and current_date < joined_on:
+                continue
+
+            pd = prod_map.get(entry_key)
+            leave_hours = leave_hours_map.get(entry_key, 0)
+
+            is_full_day_leave = False
+            is_half_day_leave = False
+            is_short_leave = False
+            has_production = pd and pd["production"] > 0
+
+            if is_supervisor:
+                attendance_status = "PRESENT"
+                production = round(pd["production"], 2) if pd else 0.0
+                client_names_str = ", ".join(sorted(pd["clients"])) if pd and pd["clients"] else None
+
+                # Mark as OVERTIME if working on non-working day (weekend/holiday)
+                if non_working_day and has_production:
+                    attendance_status = "OVERTIME"
+                elif non_working_day and not has_production:
+                    continue  # Skip non-working day records with no production for supervisors
+
+            elif entry_key in entry_map and entry_map[entry_key] == TaskEntryStatus.APPROVED:
+
+                # Categorize Leave
+                if leave_hours >= 8 or leave_hours > 4:
+                    is_full_day_leave = True
+                elif leave_hours > 2:
+                    is_half_day_leave = True
+                elif leave_hours > 0:
+                    is_short_leave = True
+
+                if has_production:
+                    attendance_status = "PRESENT"
+                    production = round(pd["production"], 2)
+                    client_names_str = ", ".join(sorted(pd["clients"])) if pd["clients"] else None
+                elif leave_hours > 0:
+                    attendance_status = "LEAVE"
+                    production = None
+                    client_names_str = None
+                else:
+                    attendance_status = "ABSENT"
+                    production = None
+                    client_names_str = None
+
+                # Mark as OVERTIME if working on non-working day (weekend/holiday)
+                if non_working_day and has_production:
+                    attendance_status = "OVERTIME"
+
+            else:
+                attendance_status = "ABSENT"
+                production = None
+                client_names_str = None
+
+            # Skip ABSENT records on non-working days (treat as holidays)
+            if non_working_day and attendance_status == "ABSENT":
+                continue
+
+            rows.append(AttendanceRow(
+                date=current_date,
+                employee_name=uname,
+                employee_email=uemail,
+                attendance_status=attendance_status,
+                production=production,
+                client_names=client_names_str,
+                leave_hours=leave_hours,
+                is_full_day_leave=is_full_day_leave,
+                is_half_day_leave=is_half_day_leave,
+                is_short_leave=is_short_leave,
+                is_non_working_day=non_working_day,
+            ))
+
+    return rows
@@ -0,0 +1,58 @@
+from datetime import date
+from threading import Lock
+from time import monotonic
+from typing import FrozenSet, Optional, Tuple
+
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.holiday import Holiday
+from app.models.working_saturday import WorkingSaturday
+
+# Calendar tables hold a few dozen rows a year and change rarely, so they are
+# kept per process as date sets. Writers in this process invalidate right away;
+# other workers pick changes up once the TTL runs out.
+CALENDAR_TTL = 5 * 60
+
+CALENDAR_DAYS_STMT = union_all(
+    select(Holiday.holiday_date.label("day"), literal("holiday").label("kind")),
+    select(WorkingSaturday.work_date, literal("working_saturday")),
+)
+
+_lock = Lock()
+_calendar: Optional[Tuple[FrozenSet[date], FrozenSet[date]]] = None
+_loaded_at = 0.0
+
+
+def get_calendar(db: Session) -> Tuple[FrozenSet[date], FrozenSet[date]]:
+    """Return (holiday dates, working Saturday dates), loading them when stale."""
+    global _calendar, _loaded_at
+    calendar = _calendar
+    if calendar is not None and monotonic() - _loaded_at < CALENDAR_TTL:
+        return calendar
+    with _lock:
+        if _calendar is None or monotonic() - _loaded_at >= CALENDAR_TTL:
+            rows = db.execute(CALENDAR_DAYS_STMT).all()
+            _calendar = (
+                frozenset(day for day, kind in rows if kind == "holiday"),
+                frozenset(day for day, kind in rows if kind == "working_saturday"),
+            )
+            _loaded_at = monotonic()
+        return _calendar
+
+
+def invalidate_calendar():
+    """Drop the cached calendar after a holiday or working Saturday write."""
+    global _calendar
+    with _lock:
+        _calendar = None
+
+
+def is_holiday(work_date: date, db: Session) -> bool:
+    """Check if the given date is a defined holiday."""
+    return work_date in get_calendar(db)[0]
+
+
+def is_working_saturday(work_date: date, db: Session) -> bool:
+    """Check if the given date is a defined working Saturday."""
+    return work_date in get_calendar(db)[1]
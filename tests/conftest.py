@@ -7,6 +7,7 @@ from app.db.session import Base, get_db
 from app.core.security import get_password_hash
 from app.models.user import User, UserRole
 from app.models.client import Client
+from app.services.calendar_cache import invalidate_calendar
 import os
 
 # Test database URL
@@ -49,6 +50,7 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    invalidate_calendar()  # each test rolls back its calendar rows
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -120,3 +122,14 @@ def test_client(db_session, admin_user):
     db_session.commit()
     db_session.refresh(client)
     return client
+
+
+@pytest.fixture
+def test_task_master(db_session):
+    """Create a profitable task master for sub-entries"""
+    from app.models.task_master import TaskMaster
+    task_master = TaskMaster(name="Coding", is_profitable=True)
+    db_session.add(task_master)
+    db_session.commit()
+    db_session.refresh(task_master)
+    return task_master
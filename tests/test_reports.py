@@ -98,6 +98,46 @@ class TestReports:
         data = response.json()
         assert isinstance(data, list)
 
+    def test_leave_summary(self, client, admin_token, employee_user, db_session):
+        """Test leave counts grouped by employee and status"""
+        from app.models.leave_request import LeaveRequest, LeaveStatus
+        today = date.today()
+        for start_offset, end_offset, leave_status in [
+            (1, 2, LeaveStatus.APPROVED),
+            (4, 4, LeaveStatus.APPROVED),
+            (6, 6, LeaveStatus.PENDING),
+            (40, 42, LeaveStatus.APPROVED),  # outside the requested range
+        ]:
+            db_session.add(LeaveRequest(
+                user_id=employee_user.id,
+                from_date=today + timedelta(days=start_offset),
+                to_date=today + timedelta(days=end_offset),
+                reason="Summary test leave",
+                status=leave_status
+            ))
+        db_session.commit()
+
+        from_date = today.isoformat()
+        to_date = (today + timedelta(days=10)).isoformat()
+        response = client.get(
+            f"/admin/reports/leave/summary?from_date={from_date}&to_date={to_date}",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        rows = sorted((item["employee_name"], item["status"], item["leave_count"]) for item in response.json())
+        assert rows == [
+            ("Employee Test", "APPROVED", 2),
+            ("Employee Test", "PENDING", 1),
+        ]
+
+    def test_report_rejects_malformed_ids(self, client, admin_token):
+        """Test that id filters are validated before querying"""
+        response = client.get(
+            "/admin/reports/timesheet?date_range=this_month&client_ids=not-a-uuid",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
     def test_reports_require_admin(self, client, employee_token):
         """Test that reports require admin access"""
         from_date = date.today().isoformat()
@@ -119,3 +159,53 @@ class TestReports:
             headers={"Authorization": f"Bearer {admin_token}"}
         )
         assert response.status_code == status.HTTP_200_OK
+
+    def test_attendance_export_includes_supervisors(self, client, admin_token, db_session):
+        """Test attendance Excel export with a supervisor in the user set"""
+        from app.core.security import get_password_hash
+        from app.models.user import User, UserRole
+
+        supervisor = User(
+            name="Supervisor Test",
+            email="supervisor_test@test.com",
+            password_hash=get_password_hash("supervisor123"),
+            role=UserRole.SUPERVISOR,
+            is_active=True
+        )
+        db_session.add(supervisor)
+        db_session.commit()
+
+        response = client.get(
+            "/admin/reports/export/attendance-excel?date_range=this_month",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith(
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+    def test_leave_export_as_csv(self, client, admin_token, employee_user, db_session):
+        """Test leave export in CSV format"""
+        from app.models.leave_request import LeaveRequest, LeaveStatus
+        today = date.today()
+        db_session.add(LeaveRequest(
+            user_id=employee_user.id,
+            from_date=today,
+            to_date=today,
+            reason="Report test leave",
+            status=LeaveStatus.APPROVED
+        ))
+        db_session.commit()
+
+        response = client.get(
+            "/admin/reports/export/leave-excel?date_range=this_month&format=csv",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.headers["content-disposition"].endswith(".csv")
+        lines = response.content.decode("utf-8-sig").splitlines()
+        assert lines == [
+            "Employee,From,To,Reason,Status,Admin Comment",
+            f"Employee Test,{today.isoformat()},{today.isoformat()},Report test leave,APPROVED,",
+        ]
@@ -1,6 +1,10 @@
+import base64
 import pytest
 from fastapi import status
 from datetime import date, timedelta
+from decimal import Decimal
+from app.api.endpoints.task_entries import calculate_task_status
+from app.models.task_entry import TaskEntryStatus
 
 
 class TestTaskEntries:
@@ -77,6 +81,79 @@ class TestTaskEntries:
         )
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_create_duplicate_reports_existing_entry(self, client, employee_token, test_client, test_task_master):
+        """Test that a second entry for the same date hits uq_user_work_date"""
+        headers = {"Authorization": f"Bearer {employee_token}"}
+        payload = {
+            "work_date": date.today().isoformat(),
+            "task_name": "Daily Work",
+            "sub_entries": [{
+                "title": "Work",
+                "hours": 7.0,
+                "task_master_id": str(test_task_master.id),
+                "client_id": str(test_client.id)
+            }]
+        }
+        assert client.post("/task-entries", headers=headers, json=payload).status_code == status.HTTP_201_CREATED
+
+        response = client.post("/task-entries", headers=headers, json=payload)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Task entry already exists for this date"
+
+    def test_admin_create_duplicate_reports_existing_entry(
+        self, client, admin_token, employee_user, test_client, test_task_master
+    ):
+        """Test that admin create-for-user rejects a second entry for the same date"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        payload = {
+            "user_id": str(employee_user.id),
+            "work_date": date.today().isoformat(),
+            "task_name": "Daily Work",
+            "sub_entries": [{
+                "title": "Work",
+                "hours": 7.0,
+                "task_master_id": str(test_task_master.id),
+                "client_id": str(test_client.id)
+            }]
+        }
+        assert client.post("/task-entries/admin/create", headers=headers, json=payload).status_code == status.HTTP_201_CREATED
+
+        response = client.post("/task-entries/admin/create", headers=headers, json=payload)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "already exists" in response.json()["detail"]
+
+    def test_create_on_leave_date_reports_leave_before_duplicate(
+        self, client, employee_token, employee_user, test_client, test_task_master, db_session
+    ):
+        """Test that approved leave is reported even when the date also has an entry"""
+        from app.models.leave_request import LeaveRequest, LeaveStatus
+        headers = {"Authorization": f"Bearer {employee_token}"}
+        work_date = date.today()
+        payload = {
+            "work_date": work_date.isoformat(),
+            "task_name": "Daily Work",
+            "sub_entries": [{
+                "title": "Work",
+                "hours": 7.0,
+                "task_master_id": str(test_task_master.id),
+                "client_id": str(test_client.id)
+            }]
+        }
+        assert client.post("/task-entries", headers=headers, json=payload).status_code == status.HTTP_201_CREATED
+
+        db_session.add(LeaveRequest(
+            user_id=employee_user.id,
+            from_date=work_date,
+            to_date=work_date,
+            reason="Sick",
+            status=LeaveStatus.APPROVED
+        ))
+        db_session.commit()
+
+        response = client.post("/task-entries", headers=headers, json=payload)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Cannot create task entry on a date with approved leave"
+
     def test_list_task_entries(self, client, employee_token, test_client):
         """Test listing task entries"""
         # Create a task entry first
@@ -100,6 +177,52 @@ class TestTaskEntries:
         data = response.json()
         assert len(data) >= 1
 
+    def test_list_task_entries_cursor(self, client, employee_token, test_client, test_task_master):
+        """Test paging task entries with the X-Next-Cursor header"""
+        headers = {"Authorization": f"Bearer {employee_token}"}
+        for days_ago in range(3):
+            client.post(
+                "/task-entries",
+                headers=headers,
+                json={
+                    "work_date": (date.today() - timedelta(days=days_ago)).isoformat(),
+                    "task_name": "Paged Task",
+                    "sub_entries": [{
+                        "title": "Work",
+                        "hours": 7.0,
+                        "task_master_id": str(test_task_master.id),
+                        "client_id": str(test_client.id)
+                    }]
+                }
+            )
+
+        first_page = client.get("/task-entries?limit=2", headers=headers)
+        assert first_page.status_code == status.HTTP_200_OK
+        cursor = first_page.headers["X-Next-Cursor"]
+
+        second_page = client.get(f"/task-entries?limit=2&cursor={cursor}", headers=headers)
+        assert second_page.status_code == status.HTTP_200_OK
+        assert "X-Next-Cursor" not in second_page.headers
+
+        work_dates = [entry["work_date"] for entry in first_page.json() + second_page.json()]
+        assert work_dates == [(date.today() - timedelta(days=d)).isoformat() for d in range(3)]
+
+        response = client.get("/task-entries?cursor=not-a-cursor", headers=headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        # Well-formed base64 JSON whose values are not strings
+        non_string_cursor = base64.urlsafe_b64encode(b"[1,2]").decode().rstrip("=")
+        response = client.get(f"/task-entries?cursor={non_string_cursor}", headers=headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_list_task_entries_zero_limit(self, client, employee_token, admin_token):
+        """Test that limit=0 returns an empty page without a next cursor"""
+        for url, token in [("/task-entries", employee_token), ("/task-entries/admin/all", admin_token)]:
+            response = client.get(f"{url}?limit=0", headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == []
+            assert "X-Next-Cursor" not in response.headers
+
     def test_get_task_entry(self, client, employee_token, test_client):
         """Test getting specific task entry"""
         today = date.today().isoformat()
@@ -147,6 +270,47 @@ class TestTaskEntries:
         data = response.json()
         assert data["task_name"] == "Updated Task"
 
+    def test_update_sub_entries_in_place(self, client, employee_token, test_client, test_task_master):
+        """Test that sub-entries sent back with their id are updated, not replaced"""
+        def sub_entry(title, hours, **extra):
+            return {
+                "title": title,
+                "hours": hours,
+                "task_master_id": str(test_task_master.id),
+                "client_id": str(test_client.id),
+                **extra
+            }
+
+        headers = {"Authorization": f"Bearer {employee_token}"}
+        create_response = client.post(
+            "/task-entries",
+            headers=headers,
+            json={
+                "work_date": date.today().isoformat(),
+                "task_name": "In-place Update",
+                "sub_entries": [sub_entry("Keep", 3.0), sub_entry("Edit", 2.0), sub_entry("Drop", 1.0)]
+            }
+        )
+        ids = {sub["title"]: sub["id"] for sub in create_response.json()["sub_entries"]}
+
+        response = client.patch(
+            f"/task-entries/{create_response.json()['id']}",
+            headers=headers,
+            json={"sub_entries": [
+                sub_entry("Keep", 3.0, id=ids["Keep"]),
+                sub_entry("Edit", 2.5, id=ids["Edit"]),
+                sub_entry("New", 1.5)
+            ]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        sub_entries = {sub["title"]: sub for sub in data["sub_entries"]}
+        assert set(sub_entries) == {"Keep", "Edit", "New"}
+        assert sub_entries["Keep"]["id"] == ids["Keep"]
+        assert sub_entries["Edit"]["id"] == ids["Edit"]
+        assert float(sub_entries["Edit"]["hours"]) == 2.5
+        assert float(data["total_hours"]) == 7.0
+
     def test_submit_task_entry(self, client, employee_token, test_client):
         """Test submitting task entry for approval"""
         today = date.today().isoformat()
@@ -190,3 +354,49 @@ class TestTaskEntries:
             headers={"Authorization": f"Bearer {employee_token}"}
         )
         assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+class TestCalculateTaskStatus:
+    """Test the working day / hours approval matrix"""
+
+    MONDAY = date(2026, 10, 12)
+    HOLIDAY_WEDNESDAY = date(2026, 10, 14)
+    SATURDAY = date(2026, 10, 17)
+    SUNDAY = date(2026, 10, 18)
+    WORKING_SATURDAY = date(2026, 10, 24)
+    HOLIDAY_WORKING_SATURDAY = date(2026, 11, 14)
+
+    @pytest.fixture
+    def calendar(self, db_session, admin_user):
+        """Mark the holidays and working Saturdays used by the matrix"""
+        from app.models.holiday import Holiday
+        from app.models.working_saturday import WorkingSaturday
+        from app.services.calendar_cache import invalidate_calendar
+        db_session.add_all([
+            Holiday(holiday_date=self.HOLIDAY_WEDNESDAY, name="Midweek Holiday", created_by=admin_user.id),
+            Holiday(holiday_date=self.HOLIDAY_WORKING_SATURDAY, name="Saturday Holiday", created_by=admin_user.id),
+            WorkingSaturday(work_date=self.WORKING_SATURDAY, month=10, year=2026, created_by=admin_user.id),
+            WorkingSaturday(work_date=self.HOLIDAY_WORKING_SATURDAY, month=11, year=2026, created_by=admin_user.id),
+        ])
+        db_session.commit()
+        invalidate_calendar()
+        yield db_session
+        invalidate_calendar()
+
+    @pytest.mark.parametrize("work_date", [MONDAY, WORKING_SATURDAY])
+    @pytest.mark.parametrize("hours, expected", [
+        ("7", (TaskEntryStatus.PENDING, False, "0")),
+        ("8", (TaskEntryStatus.APPROVED, False, "0")),
+        ("10", (TaskEntryStatus.PENDING, True, "2")),
+    ])
+    def test_working_day(self, calendar, work_date, hours, expected):
+        """Test that working days approve exactly 8 hours and count only the excess as overtime"""
+        entry_status, is_overtime, overtime_hours = calculate_task_status(work_date, Decimal(hours), calendar)
+        assert (entry_status, is_overtime, overtime_hours) == (expected[0], expected[1], Decimal(expected[2]))
+
+    @pytest.mark.parametrize("work_date", [HOLIDAY_WEDNESDAY, SATURDAY, SUNDAY, HOLIDAY_WORKING_SATURDAY])
+    @pytest.mark.parametrize("hours", ["7", "8", "10"])
+    def test_non_working_day(self, calendar, work_date, hours):
+        """Test that non-working days stay pending with all hours as overtime"""
+        entry_status, is_overtime, overtime_hours = calculate_task_status(work_date, Decimal(hours), calendar)
+        assert (entry_status, is_overtime, overtime_hours) == (TaskEntryStatus.PENDING, True, Decimal(hours))